@@ -8,6 +8,7 @@ import sqlite3
 import os
 import re
 from datetime import datetime
+from functools import lru_cache
 
 # Import query functions for reuse
 import sys
@@ -15,18 +16,25 @@ sys.path.insert(0, os.path.expanduser('~/Projects/database'))
 from database_query_functions import database_path, database_info
 
 # Local regex functions for case-insensitive search
+@lru_cache(maxsize=512)
+def _compile_case_insensitive(pattern):
+    """Compile a case-insensitive regex, cached so each pattern compiles once"""
+    return re.compile(pattern, flags=re.IGNORECASE)
+
 def _regex_search_case_insensitive(pattern, string):
     """Enable regex search in SQLite with case-insensitive matching"""
     if not isinstance(string, str):
         return False
     try:
-        return re.search(pattern, string, flags=re.IGNORECASE) is not None
+        return _compile_case_insensitive(pattern).search(string) is not None
     except Exception as e:
         return False
 
 def _register_regex_local(conn):
     """Register case-insensitive regex function with SQLite connection"""
-    conn.create_function("REGEXP", 2, _regex_search_case_insensitive)
+    # deterministic: same inputs always give the same result, so SQLite may
+    # evaluate it once per constant argument and use it in more query plans
+    conn.create_function("REGEXP", 2, _regex_search_case_insensitive, deterministic=True)
 
 """
 Setting up the database paths
@@ -103,26 +111,185 @@ def _should_skip_field(table_name, field_name):
     return False
 
 
+def _q(identifier):
+    """Quote a table or column name for use in SQL (doubles embedded quotes)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+# Session caches for database metadata (schemas are static during a session)
+# Format: {'table_name': {'columns': [...], 'foreign_keys': [...]}}
+_SCHEMA_CACHE = {}
+_TABLES_CACHE = None
+_TABLES_SET = frozenset()
+_FK_GRAPH = None
+
+
+def _invalidate_schema_cache():
+    """Clear cached table list and schemas (call after schema changes)"""
+    global _TABLES_CACHE, _TABLES_SET, _FK_GRAPH
+    _SCHEMA_CACHE.clear()
+    _TABLES_CACHE = None
+    _TABLES_SET = frozenset()
+    _FK_GRAPH = None
+    _fk_map.cache_clear()
+    _priority_fields_for_table.cache_clear()
+    _result_columns.cache_clear()
+    _detail_fields_for_table.cache_clear()
+
+
+# Shared connection, opened lazily on first use and reused for the session
+_conn = None
+
+
+def _get_conn():
+    """
+    Get the shared database connection, opening it on first use.
+    
+    Foreign key enforcement, performance PRAGMAs, and the case-insensitive
+    REGEXP function are set up once here, so helpers can use the connection
+    directly.
+    """
+    global _conn
+    if _conn is None:
+        # isolation_level=None: no implicit transactions; writes use explicit
+        # BEGIN IMMEDIATE / COMMIT so the write lock is taken once, up front
+        _conn = sqlite3.connect(database_path, isolation_level=None)
+        _conn.row_factory = sqlite3.Row     # Rows support both index and column-name access
+        cursor = _conn.cursor()
+        cursor.execute("PRAGMA foreign_keys = ON")
+
+        # Performance settings for a local, single-user database
+        cursor.execute("PRAGMA journal_mode = WAL")      # Readers don't block the writer
+        cursor.execute("PRAGMA synchronous = NORMAL")    # No fsync on every commit in WAL mode
+        cursor.execute("PRAGMA busy_timeout = 5000")     # Wait up to 5s for locks
+        cursor.execute("PRAGMA temp_store = MEMORY")
+        cursor.execute("PRAGMA cache_size = -20000")     # ~20 MB page cache
+        cursor.execute("PRAGMA mmap_size = 268435456")   # Memory-map up to 256 MB of the file
+        cursor.close()
+
+        _register_regex_local(_conn)
+        
+        # Index FK columns, then refresh planner statistics where they're stale
+        _ensure_fk_indexes()
+        cursor = _conn.cursor()
+        cursor.execute("PRAGMA optimize")
+        cursor.close()
+    return _conn
+
+
+def _rollback_if_open(conn):
+    """Roll back the current explicit transaction, if one is still open"""
+    if conn.in_transaction:
+        cursor = conn.cursor()
+        cursor.execute("ROLLBACK")
+        cursor.close()
+
+
 def _get_all_tables():
     """Get list of all tables in the database"""
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    global _TABLES_CACHE, _TABLES_SET
+    if _TABLES_CACHE is not None:
+        return _TABLES_CACHE
     
+    cursor = _get_conn().cursor()
+    
+    # Full-text index tables ({table}_fts and their shadow tables) and SQLite's
+    # own tables (sqlite_sequence, sqlite_stat1) are internal
     cursor.execute("""
         SELECT name 
         FROM sqlite_master 
         WHERE type='table'
+          AND name NOT LIKE '%\\_fts%' ESCAPE '\\'
+          AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
         ORDER BY name;
     """)
     
     tables = [row[0] for row in cursor.fetchall()]
     
     cursor.close()
-    conn.close()
     
+    _TABLES_CACHE = tables
+    _TABLES_SET = frozenset(tables)
     return tables
 
 
+def _ensure_fk_indexes():
+    """
+    Create an index on every foreign key column that doesn't already lead one
+    
+    Reference checks (e.g. in delete_entry) then use an index seek instead of
+    a full table scan. Safe to call repeatedly.
+    """
+    conn = _get_conn()
+    cursor = conn.cursor()
+    
+    try:
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        for table in _get_all_tables():
+            if table.startswith('sqlite_'):
+                continue
+            
+            # First column of each existing index on the table
+            cursor.execute("""
+                SELECT ii.name
+                FROM pragma_index_list(?) AS il, pragma_index_info(il.name) AS ii
+                WHERE ii.seqno = 0
+            """, (table,))
+            indexed = {row[0] for row in cursor.fetchall()}
+            
+            for fk_column in _fk_map(table):
+                if fk_column not in indexed:
+                    index_name = _q(f"idx_{table}_{fk_column}")
+                    cursor.execute(f"CREATE INDEX IF NOT EXISTS {index_name} ON {_q(table)} ({_q(fk_column)})")
+        
+        cursor.execute("COMMIT")
+    except sqlite3.OperationalError as e:
+        # e.g. read-only database file: searches still work, just unindexed
+        _rollback_if_open(conn)
+        print(f"⚠️  Could not create foreign key indexes: {e}")
+    finally:
+        cursor.close()
+
+
+def _get_fk_graph():
+    """
+    Get the database-wide foreign key graph (one query, cached for the session)
+    
+    Returns:
+        dict of {referenced_table: [(table, fk_column), ...]}
+    """
+    global _FK_GRAPH
+    if _FK_GRAPH is not None:
+        return _FK_GRAPH
+    
+    cursor = _get_conn().cursor()
+    
+    cursor.execute("""
+        SELECT m.name, fk."from", fk."table"
+        FROM sqlite_master AS m
+        JOIN pragma_foreign_key_list(m.name) AS fk
+        WHERE m.type = 'table'
+        ORDER BY m.name, fk.id, fk.seq
+    """)
+    
+    graph = {}
+    for table, fk_column, ref_table in cursor.fetchall():
+        graph.setdefault(ref_table, []).append((table, fk_column))
+    
+    cursor.close()
+    
+    _FK_GRAPH = graph
+    return graph
+
+
+def _table_exists(table_name):
+    """Check if a table exists (set lookup against the cached table list)"""
+    if _TABLES_CACHE is None:
+        _get_all_tables()
+    return table_name in _TABLES_SET
+
+
 def _get_table_schema(table_name):
     """
     Get complete schema information for a table
@@ -130,42 +297,112 @@ def _get_table_schema(table_name):
     Returns:
         dict with 'columns' and 'foreign_keys' keys
     """
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    if table_name in _SCHEMA_CACHE:
+        return _SCHEMA_CACHE[table_name]
     
-    # Get column information
-    cursor.execute(f"PRAGMA table_info({table_name})")
+    cursor = _get_conn().cursor()
+    
+    # Get column information (table-valued PRAGMA, so the name is a bound parameter)
+    cursor.execute("SELECT * FROM pragma_table_info(?)", (table_name,))
     columns = cursor.fetchall()
     # Structure: (cid, name, type, notnull, default_val, pk)
     
     # Get foreign key information
-    cursor.execute(f"PRAGMA foreign_key_list({table_name})")
+    cursor.execute("SELECT * FROM pragma_foreign_key_list(?)", (table_name,))
     foreign_keys = cursor.fetchall()
     # Structure: (id, seq, ref_table, from_col, to_col, on_update, on_delete, match)
     
     cursor.close()
-    conn.close()
     
-    return {
+    schema = {
         'columns': columns,
         'foreign_keys': foreign_keys
     }
+    _SCHEMA_CACHE[table_name] = schema
+    return schema
 
 
 def _get_next_uid(table_name):
     """Get the next available UID for a table"""
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
-    cursor.execute(f"SELECT MAX(UID) FROM {table_name}")
+    # AUTOINCREMENT tables record their last UID in sqlite_sequence (single-row lookup)
+    try:
+        cursor.execute("SELECT seq FROM sqlite_sequence WHERE name = ?", (table_name,))
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.close()
+            return row[0] + 1
+    except sqlite3.OperationalError:
+        pass    # No AUTOINCREMENT tables in this database
+    
+    cursor.execute(f"SELECT MAX(UID) FROM {_q(table_name)}")
     max_uid = cursor.fetchone()[0]
     
     cursor.close()
-    conn.close()
     
     return (max_uid or 0) + 1
 
 
+def _uid_is_rowid(table_name):
+    """
+    Check if SQLite can assign the UID itself with INSERT ... RETURNING
+    
+    True when UID is the table's only primary key, declared INTEGER (so it
+    aliases the rowid), and the SQLite library supports RETURNING (3.35+).
+    """
+    if sqlite3.sqlite_version_info < (3, 35, 0):
+        return False
+    
+    columns = _get_table_schema(table_name)['columns']
+    pk_columns = [col for col in columns if col[5]]
+    
+    return (len(pk_columns) == 1
+            and pk_columns[0][1] == 'UID'
+            and pk_columns[0][2].upper() == 'INTEGER')
+
+
+@lru_cache(maxsize=64)
+def _fk_map(table_name):
+    """
+    Get all foreign key relationships of a table, keyed by column
+    
+    Returns:
+        dict of {fk_column: {'ref_table', 'ref_column', 'fk_column'}}
+    """
+    # fk structure: (id, seq, ref_table, from_col, to_col, on_update, on_delete, match)
+    return {
+        fk[3]: {
+            'ref_table': fk[2],      # Which table it references
+            'ref_column': fk[4],     # Which column (usually 'UID')
+            'fk_column': fk[3]       # Your column name
+        }
+        for fk in _get_table_schema(table_name)['foreign_keys']
+    }
+
+
+@lru_cache(maxsize=64)
+def _select_by_uid_sql(table_name):
+    """Get the (cached) SQL text for fetching one row of a table by UID"""
+    return f"SELECT * FROM {_q(table_name)} WHERE UID = ?"
+
+
+@lru_cache(maxsize=128)
+def _insert_sql(table_name, columns, returning=False):
+    """
+    Build (and cache) the INSERT statement for a table and column tuple
+    
+    Args:
+        table_name: Table to insert into
+        columns: Tuple of column names, in parameter order
+        returning: Append RETURNING UID to get the assigned UID back
+    """
+    placeholders = ', '.join(['?' for _ in columns])
+    column_sql = ', '.join(_q(c) for c in columns)
+    query = f"INSERT INTO {_q(table_name)} ({column_sql}) VALUES ({placeholders})"
+    return query + " RETURNING UID" if returning else query
+
+
 def _get_fk_info(table_name, fk_column):
     """
     Get information about a foreign key relationship
@@ -173,18 +410,37 @@ def _get_fk_info(table_name, fk_column):
     Returns:
         dict with 'ref_table', 'ref_column', 'fk_column' or None
     """
-    schema = _get_table_schema(table_name)
+    return _fk_map(table_name).get(fk_column)
+
+
+def _truncate(value, max_len=60):
+    """Shorten a value for display, adding '...' if it exceeds max_len characters"""
+    text = value if isinstance(value, str) else str(value)
+    return text if len(text) <= max_len else text[:max_len] + "..."
+
+
+def _parse_menu(choice, n):
+    """
+    Parse a menu response once into an action
     
-    for fk in schema['foreign_keys']:
-        # fk structure: (id, seq, ref_table, from_col, to_col, on_update, on_delete, match)
-        if fk[3] == fk_column:  # fk[3] is the 'from' column
-            return {
-                'ref_table': fk[2],      # Which table it references
-                'ref_column': fk[4],     # Which column (usually 'UID')
-                'fk_column': fk[3]       # Your column name
-            }
+    Args:
+        choice: Raw user input
+        n: Number of selectable items (numbered 1-n)
     
-    return None
+    Returns:
+        tuple: ('empty',), ('cancel',) for q/c, ('search',) for s,
+               ('pick', index) for a valid 0-based index, or ('bad',)
+    """
+    choice = choice.strip().lower()
+    if not choice:
+        return ('empty',)
+    if choice in ('q', 'c'):
+        return ('cancel',)
+    if choice == 's':
+        return ('search',)
+    if choice.isdigit() and 1 <= int(choice) <= n:
+        return ('pick', int(choice) - 1)
+    return ('bad',)
 
 
 def _is_column_required(column_info):
@@ -213,6 +469,19 @@ SKIP_SEARCH_COLUMNS = SYSTEM_FIELDS | {
 }
 
 
+# Precompiled patterns used by _normalize_search_term
+# Special regex chars: . ^ $ * + ? { } [ ] \ | ( )
+_ESCAPE_RE = re.compile(r'([.^$*+?{}\[\]\\|()])')
+# Apostrophe-like characters: ' (U+0027), ' (U+2019), ʻ (U+02BB), ` (U+0060)
+_APOSTROPHE_RE = re.compile(r"['ʻ`'']")
+
+
+def _like_escape(term):
+    """Escape LIKE wildcards (% and _) so the term matches literally with ESCAPE '\\'"""
+    return term.replace('\\', '\\\\').replace('%', '\\%').replace('_', '\\_')
+
+
+@lru_cache(maxsize=256)
 def _normalize_search_term(search_term):
     """
     Normalize search term for better matching
@@ -220,18 +489,22 @@ def _normalize_search_term(search_term):
     - Makes apostrophes flexible to match different Unicode variants
     """
     # Escape special regex characters (except apostrophes, we'll handle those specially)
-    # Special regex chars: . ^ $ * + ? { } [ ] \ | ( )
-    escaped = re.sub(r'([.^$*+?{}\[\]\\|()])', r'\\\1', search_term)
+    escaped = _ESCAPE_RE.sub(r'\\\1', search_term)
     
     # Replace any apostrophe-like character with alternation pattern
     # Using (?:...) non-capturing group with | alternation works better in SQLite
-    # This handles: ' (U+0027), ' (U+2019), ʻ (U+02BB), ` (U+0060)
     apostrophe_pattern = r"(?:'|'|ʻ|`)"
-    normalized = re.sub(r"['ʻ`'']", apostrophe_pattern, escaped)
+    normalized = _APOSTROPHE_RE.sub(apostrophe_pattern, escaped)
     
     return normalized
 
 
+def _get_text_columns(table_name):
+    """Get the searchable TEXT columns of a table (excluding SKIP_SEARCH_COLUMNS)"""
+    return [col[1] for col in _get_table_schema(table_name)['columns']
+            if col[1] not in SKIP_SEARCH_COLUMNS and col[2] in ('TEXT', 'VARCHAR', '')]
+
+
 def _search_in_table(ref_table, search_term, max_results=20):
     """
     Search ALL text fields in a table for matches
@@ -242,60 +515,76 @@ def _search_in_table(ref_table, search_term, max_results=20):
         max_results: Maximum number of results to return
     
     Returns:
-        List of dicts with all column values
+        List of sqlite3.Row objects with all column values (access by column name)
     """
-    conn = sqlite3.connect(database_path)
-    _register_regex_local(conn)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     # Normalize search term for better matching (handles apostrophes, escapes special chars)
     normalized_term = _normalize_search_term(search_term)
     
-    # Get all columns
-    cursor.execute(f"PRAGMA table_info({ref_table})")
-    columns = cursor.fetchall()
-    
-    # Filter to searchable TEXT columns
-    text_columns = []
-    all_columns = []
-    
-    for col in columns:
-        col_name = col[1]
-        col_type = col[2]
-        all_columns.append(col_name)
-        
-        # Skip non-searchable columns
-        if col_name in SKIP_SEARCH_COLUMNS:
-            continue
-        
-        # Include TEXT fields
-        if col_type in ['TEXT', 'VARCHAR', '']:
-            text_columns.append(col_name)
-    
+    # Get all columns (main display field first) and the searchable TEXT columns
+    all_columns = _result_columns(ref_table)
+    text_columns = _get_text_columns(ref_table)
+    select_sql = ', '.join(_q(c) for c in all_columns)
+
+    # A bare number is most likely a UID: try a direct primary key lookup first
+    # and only fall back to the text search if no row has that UID
+    if search_term.isdigit() and 'UID' in all_columns:
+        cursor.execute(f"SELECT {select_sql} FROM {_q(ref_table)} WHERE UID = ?",
+                       (int(search_term),))
+        row = cursor.fetchone()
+        if row is not None:
+            cursor.close()
+            return [row]
+
     if not text_columns:
         print(f"⚠️  No searchable text columns found in {ref_table}")
-        print(f"   Available columns: {all_columns}")
+        print(f"   Available columns: {list(all_columns)}")
         cursor.close()
-        conn.close()
         return []
     
     # Build OR query across all text fields
-    where_clauses = [f"{col} REGEXP ?" for col in text_columns]
+    if search_term.isascii() and not _APOSTROPHE_RE.search(search_term):
+        # Plain ASCII term: SQLite's LIKE is already case-insensitive for ASCII,
+        # so match in C instead of calling the Python REGEXP function per cell
+        match_term = '%' + _like_escape(search_term) + '%'
+        where_clauses = [f"{_q(col)} LIKE ? ESCAPE '\\'" for col in text_columns]
+    else:
+        # Non-ASCII case folding and apostrophe variants need REGEXP
+        match_term = normalized_term
+        where_clauses = [f"{_q(col)} REGEXP ?" for col in text_columns]
     where_sql = " OR ".join(where_clauses)
     
-    query = f"""
-        SELECT {', '.join(all_columns)}
-        FROM {ref_table}
-        WHERE {where_sql}
-        LIMIT ?
-    """
-    
-    # Execute with normalized search term repeated for each column
-    params = tuple([normalized_term] * len(text_columns) + [max_results])
+    # Execute with the match term repeated for each column
+    params = tuple([match_term] * len(text_columns) + [max_results])
+    
+    # If a full-text index exists, use it to narrow the candidate rows first;
+    # the LIKE/REGEXP filter still decides the final match
+    fts_term = _fts_match_term(ref_table, search_term, text_columns)
+    
+    if fts_term:
+        fts_table = _q(_fts_table_name(ref_table))
+        query = f"""
+            SELECT {select_sql}
+            FROM {_q(ref_table)}
+            WHERE UID IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH ?)
+              AND ({where_sql})
+            LIMIT ?
+        """
+        params = (fts_term,) + params
+    else:
+        query = f"""
+            SELECT {select_sql}
+            FROM {_q(ref_table)}
+            WHERE {where_sql}
+            LIMIT ?
+        """
     
     try:
+        # Rows are read straight off the cursor, at most max_results of them
+        # (LIMIT already stops SQLite from producing more)
         cursor.execute(query, params)
-        results = cursor.fetchall()
+        results = cursor.fetchmany(max_results)
     except Exception as e:
         print(f"❌ Search error in {ref_table}: {e}")
         print(f"   Query: {query}")
@@ -304,10 +593,56 @@ def _search_in_table(ref_table, search_term, max_results=20):
         results = []
     
     cursor.close()
-    conn.close()
     
-    # Convert to list of dicts
-    return [dict(zip(all_columns, row)) for row in results]
+    return results
+
+
+# Priority fields to show first in search results (if they exist)
+DISPLAY_PRIORITY_FIELDS = [
+    'Name_Arabic', 'Title', 'Nickname', 'Acronym', 'Term', 
+    'Author', 'Name_English', 'Name_Foreign', 'Name_Latin',
+    'Name_Strict_Translit', 'Location_Name_Arabic', 'Translation'
+]
+
+
+@lru_cache(maxsize=64)
+def _priority_fields_for_table(ref_table):
+    """Get the DISPLAY_PRIORITY_FIELDS present in a table, in priority order"""
+    column_names = {col[1] for col in _get_table_schema(ref_table)['columns']}
+    return tuple(field for field in DISPLAY_PRIORITY_FIELDS if field in column_names)
+
+
+@lru_cache(maxsize=64)
+def _result_columns(ref_table):
+    """
+    Get the column order used for search results: UID, then the table's main
+    display field, then the remaining columns in table order
+    """
+    column_names = [col[1] for col in _get_table_schema(ref_table)['columns']]
+    lead = [c for c in ('UID',) + _priority_fields_for_table(ref_table)[:1] if c in column_names]
+    return tuple(lead + [c for c in column_names if c not in lead])
+
+
+def _main_display_field(row, ref_table):
+    """
+    Get the main field to display for a result row
+    
+    Returns:
+        tuple of (field_name, value) for the first non-empty priority field,
+        or (None, None) if the row has none
+    """
+    for field in _priority_fields_for_table(ref_table):
+        if row[field]:
+            return field, row[field]
+    return None, None
+
+
+@lru_cache(maxsize=64)
+def _detail_fields_for_table(ref_table):
+    """Get the columns eligible as secondary fields in search results"""
+    return tuple(col[1] for col in _get_table_schema(ref_table)['columns']
+                 if col[1] != 'UID' and not col[1].startswith('_')
+                 and col[1] not in SKIP_SEARCH_COLUMNS)
 
 
 def _display_fk_results(results, ref_table):
@@ -316,54 +651,44 @@ def _display_fk_results(results, ref_table):
     
     Tries to intelligently pick the most relevant fields to show
     """
-    # Priority fields to show first (if they exist)
-    priority_fields = [
-        'Name_Arabic', 'Title', 'Nickname', 'Acronym', 'Term', 
-        'Author', 'Name_English', 'Name_Foreign', 'Name_Latin',
-        'Name_Strict_Translit', 'Location_Name_Arabic', 'Translation'
-    ]
+    detail_fields = _detail_fields_for_table(ref_table)
     
     for i, row in enumerate(results, 1):
-        # Find the main field to display
-        main_field = None
-        main_value = None
-        
-        for field in priority_fields:
-            if field in row and row[field]:
-                main_field = field
-                main_value = row[field]
-                break
+        # Find the main field to display (first non-empty priority field)
+        main_field, main_value = _main_display_field(row, ref_table)
         
         # Fallback to UID if nothing else
         if not main_value:
-            main_value = f"Entry {row.get('UID', '?')}"
+            main_value = f"Entry {row['UID']}"
         
         print(f"{i}. {main_value}")
         
         # Show other relevant non-null fields (max 3 additional)
         shown = 0
-        for key, val in row.items():
-            if (key != 'UID' and key != main_field and val and 
-                not key.startswith('_') and key not in SKIP_SEARCH_COLUMNS):
+        for key in detail_fields:
+            val = row[key]
+            if key != main_field and val:
                 print(f"   {key}: {val}")
                 shown += 1
                 if shown >= 3:
                     break
 
 
-def _resolve_foreign_key(table_name, fk_column):
+def _resolve_foreign_key(table_name, fk_column, fk_info=None):
     """
     Interactive foreign key resolution
     
     Args:
         table_name: The table being edited
         fk_column: The foreign key column name
+        fk_info: FK relationship info if the caller already has it (optional)
     
     Returns:
         int: UID of selected entry, or None if skipped
     """
     # Get FK relationship info
-    fk_info = _get_fk_info(table_name, fk_column)
+    if fk_info is None:
+        fk_info = _get_fk_info(table_name, fk_column)
     
     if not fk_info:
         print(f"⚠️  {fk_column} is not a foreign key")
@@ -409,12 +734,8 @@ def _resolve_foreign_key(table_name, fk_column):
             idx = int(choice) - 1
             if 0 <= idx < len(results):
                 selected_uid = results[idx]['UID']
-                # Show what was selected
-                main_display = None
-                for field in ['Name_Arabic', 'Title', 'Nickname', 'Acronym', 'Author']:
-                    if field in results[idx] and results[idx][field]:
-                        main_display = results[idx][field]
-                        break
+                # Show what was selected (same main field as the result list)
+                main_display = _main_display_field(results[idx], ref_table)[1]
                 print(f"   ✅ Selected: {main_display or 'UID ' + str(selected_uid)}")
                 return selected_uid
             else:
@@ -423,6 +744,130 @@ def _resolve_foreign_key(table_name, fk_column):
             print("   ❌ Invalid input")
 
 
+"""
+Full-Text Search Index Functions
+"""
+
+def _fts_table_name(table_name):
+    """Name of the FTS5 index table for a table"""
+    return f"{table_name}_fts"
+
+
+def _fts_match_term(table_name, search_term, text_columns):
+    """
+    Build an FTS5 MATCH expression for a search term, if the index can be used.
+    
+    The index uses the trigram tokenizer, so a quoted phrase matches any
+    case-insensitive substring of 3+ characters. Apostrophe variants are
+    matched by REGEXP, so only the longest apostrophe-free part of the term
+    is sent to the index.
+    
+    Returns:
+        str: MATCH expression, or None if the table has no usable index
+    """
+    fts_columns = {col[1] for col in _get_table_schema(_fts_table_name(table_name))['columns']}
+    
+    # No index yet, or the index is missing columns added since it was built
+    if not fts_columns or not set(text_columns) <= fts_columns:
+        return None
+    
+    literal = max(_APOSTROPHE_RE.split(search_term), key=len)
+    if len(literal) < 3:
+        return None
+    
+    return '"' + literal.replace('"', '""') + '"'
+
+
+def build_search_index(table_name=None):
+    """
+    Build FTS5 full-text indexes used to speed up searches in add/update/delete.
+    
+    Creates an external-content FTS5 table ({table}_fts) over the searchable
+    text columns, plus triggers that keep it in sync with the table. Safe to
+    re-run: existing indexes are dropped and rebuilt from the current schema.
+    
+    Args:
+        table_name (str, optional): Table to index. If None, indexes every
+                                    table that has a UID and text columns.
+    
+    Returns:
+        list: Names of the tables that were indexed
+    
+    Examples:
+        build_search_index()                 # Index all tables
+        build_search_index('bibliography')   # Index one table
+    """
+    tables = [table_name] if table_name else [
+        t for t in _get_all_tables() if not t.startswith('sqlite_')
+    ]
+    
+    conn = _get_conn()
+    cursor = conn.cursor()
+    indexed = []
+    
+    try:
+        for table in tables:
+            column_names = [col[1] for col in _get_table_schema(table)['columns']]
+            text_columns = _get_text_columns(table)
+            
+            if 'UID' not in column_names or not text_columns:
+                continue
+            
+            fts_name = _fts_table_name(table)
+            fts_table = _q(fts_name)
+            cols = ', '.join(_q(c) for c in text_columns)
+            new_cols = ', '.join(f"new.{_q(c)}" for c in text_columns)
+            old_cols = ', '.join(f"old.{_q(c)}" for c in text_columns)
+            # content= takes the table name as a string literal
+            content = "'" + table.replace("'", "''") + "'"
+            
+            cursor.execute("BEGIN IMMEDIATE")
+            cursor.execute(f"DROP TABLE IF EXISTS {fts_table}")
+            cursor.execute(f"""
+                CREATE VIRTUAL TABLE {fts_table} USING fts5(
+                    {cols}, content={content}, content_rowid='UID', tokenize='trigram'
+                )
+            """)
+            
+            # Triggers keep the index in sync with inserts, updates, and deletes
+            cursor.execute(f"DROP TRIGGER IF EXISTS {_q(fts_name + '_ai')}")
+            cursor.execute(f"""
+                CREATE TRIGGER {_q(fts_name + '_ai')} AFTER INSERT ON {_q(table)} BEGIN
+                    INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.UID, {new_cols});
+                END
+            """)
+            cursor.execute(f"DROP TRIGGER IF EXISTS {_q(fts_name + '_ad')}")
+            cursor.execute(f"""
+                CREATE TRIGGER {_q(fts_name + '_ad')} AFTER DELETE ON {_q(table)} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.UID, {old_cols});
+                END
+            """)
+            cursor.execute(f"DROP TRIGGER IF EXISTS {_q(fts_name + '_au')}")
+            cursor.execute(f"""
+                CREATE TRIGGER {_q(fts_name + '_au')} AFTER UPDATE ON {_q(table)} BEGIN
+                    INSERT INTO {fts_table}({fts_table}, rowid, {cols}) VALUES ('delete', old.UID, {old_cols});
+                    INSERT INTO {fts_table}(rowid, {cols}) VALUES (new.UID, {new_cols});
+                END
+            """)
+            
+            # Populate the index from the existing rows
+            cursor.execute(f"INSERT INTO {fts_table}({fts_table}) VALUES ('rebuild')")
+            cursor.execute("COMMIT")
+
+            indexed.append(table)
+            print(f"✅ Search index built: {fts_name} ({len(text_columns)} columns)")
+    
+    except sqlite3.OperationalError as e:
+        _rollback_if_open(conn)
+        print(f"❌ Could not build search index: {e}")
+        print("   (FTS5 with the trigram tokenizer requires SQLite 3.34+)")
+    finally:
+        cursor.close()
+        _invalidate_schema_cache()
+    
+    return indexed
+
+
 """
 Main Entry Functions
 """
@@ -470,7 +915,7 @@ def add_entry(table_name=None):
         table_name = tables[int(choice) - 1]
     
     # Verify table exists
-    if table_name not in _get_all_tables():
+    if not _table_exists(table_name):
         print(f"❌ Table '{table_name}' does not exist")
         return None
     
@@ -487,7 +932,7 @@ def add_entry(table_name=None):
     print("=" * 70)
     
     # Separate columns into simple and FK columns
-    fk_column_names = {fk[3] for fk in schema['foreign_keys']}
+    fk_column_names = set(_fk_map(table_name))
     
     entry_data = {'UID': next_uid}
     
@@ -539,7 +984,7 @@ def add_entry(table_name=None):
     
     for key, value in entry_data.items():
         if value is not None:
-            display_val = str(value)[:60] + "..." if len(str(value)) > 60 else value
+            display_val = _truncate(value)
             print(f"  • {key}: {display_val}")
         else:
             print(f"  • {key}: NULL")
@@ -556,38 +1001,110 @@ def add_entry(table_name=None):
         print("❌ Cancelled")
         return None
     
-    # Perform insertion
+    # Perform insertion (shared connection enforces FK constraints)
+    conn = _get_conn()
+    cursor = conn.cursor()
+    
     try:
-        conn = sqlite3.connect(database_path)
-        conn.execute("PRAGMA foreign_keys = ON")  # Enforce FK constraints
-        cursor = conn.cursor()
-        
-        # Build INSERT query
-        columns = ', '.join(entry_data.keys())
-        placeholders = ', '.join(['?' for _ in entry_data])
-        query = f"INSERT INTO {table_name} ({columns}) VALUES ({placeholders})"
+        # INTEGER PRIMARY KEY: let SQLite assign the UID in the same statement
+        returning = _uid_is_rowid(table_name)
+        insert_cols = tuple(k for k in entry_data if not (returning and k == 'UID'))
+        query = _insert_sql(table_name, insert_cols, returning)
         
-        cursor.execute(query, list(entry_data.values()))
-        conn.commit()
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(query, [entry_data[c] for c in insert_cols])
+        if returning:
+            next_uid = cursor.fetchall()[0][0]
+        cursor.execute("COMMIT")
         
         print(f"\n✅ Successfully inserted entry with UID: {next_uid}")
         
-        cursor.close()
-        conn.close()
-        
         return next_uid
         
     except sqlite3.IntegrityError as e:
+        _rollback_if_open(conn)
         print(f"\n❌ Database constraint error: {e}")
         print("   (This usually means a required field was NULL or a FK was invalid)")
-        conn.rollback()
-        conn.close()
         return None
     except Exception as e:
+        _rollback_if_open(conn)
         print(f"\n❌ Unexpected error: {e}")
-        conn.rollback()
-        conn.close()
         return None
+    finally:
+        cursor.close()
+
+
+def bulk_add(table_name, rows):
+    """
+    Add many entries to a table at once, without prompts, in one transaction.
+    Either all rows are inserted or none are.
+    
+    Args:
+        table_name (str): Name of table to add to
+        rows (list of dict): Column values for each new entry. Columns left
+                             out are inserted as NULL; a UID is assigned
+                             automatically unless one is given.
+    
+    Returns:
+        list: UIDs of the inserted rows, or None if the insert failed
+    
+    Examples:
+        bulk_add('gazetteer', [{'Nickname': 'Khiva'}, {'Nickname': 'Merv'}])
+    """
+    if not _table_exists(table_name):
+        print(f"❌ Table '{table_name}' does not exist")
+        return None
+    
+    if not rows:
+        return []
+    
+    # Common column set across all rows, in table order
+    column_names = [col[1] for col in _get_table_schema(table_name)['columns']]
+    given = set().union(*rows)
+    unknown = given - set(column_names)
+    if unknown:
+        print(f"❌ Unknown column(s) for {table_name}: {', '.join(sorted(unknown))}")
+        return None
+    
+    insert_cols = tuple(c for c in column_names if c in given or c == 'UID')
+    query = _insert_sql(table_name, insert_cols)
+    
+    conn = _get_conn()
+    cursor = conn.cursor()
+    
+    try:
+        # Holding the write lock makes MAX(UID)+1 safe for the whole batch
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        next_uid = _get_next_uid(table_name)
+        uids = []
+        for row in rows:
+            if row.get('UID') is None:
+                uids.append(next_uid)
+                next_uid += 1
+            else:
+                uids.append(row['UID'])
+        
+        params = [[uid if c == 'UID' else row.get(c) for c in insert_cols]
+                  for uid, row in zip(uids, rows)]
+        cursor.executemany(query, params)
+        cursor.execute("COMMIT")
+        
+        print(f"✅ Inserted {len(uids)} entries into {table_name}")
+        
+        return uids
+        
+    except sqlite3.IntegrityError as e:
+        _rollback_if_open(conn)
+        print(f"❌ Database constraint error: {e}")
+        print("   (No entries were inserted)")
+        return None
+    except Exception as e:
+        _rollback_if_open(conn)
+        print(f"❌ Unexpected error: {e}")
+        return None
+    finally:
+        cursor.close()
 
 
 def update_entry(table_name=None, uid=None, field_name=None):
@@ -639,7 +1156,7 @@ def update_entry(table_name=None, uid=None, field_name=None):
         table_name = tables[int(choice) - 1]
     
     # Verify table exists
-    if table_name not in _get_all_tables():
+    if not _table_exists(table_name):
         print(f"❌ Table '{table_name}' does not exist")
         return False
     
@@ -688,26 +1205,25 @@ def update_entry(table_name=None, uid=None, field_name=None):
                 print("   ❌ Invalid input")
     
     # Now we have table_name and uid - get current record
-    conn = sqlite3.connect(database_path)
-    conn.execute("PRAGMA foreign_keys = ON")
+    conn = _get_conn()
     cursor = conn.cursor()
     
     try:
         # Get the current record
-        cursor.execute(f"SELECT * FROM {table_name} WHERE UID = ?", (uid,))
+        cursor.execute(_select_by_uid_sql(table_name), (uid,))
         record = cursor.fetchone()
         
         if not record:
             print(f"❌ No record found with UID {uid} in {table_name}")
             cursor.close()
-            conn.close()
             return False
         
         # Get column info
         schema = _get_table_schema(table_name)
         columns = schema['columns']
         column_names = [col[1] for col in columns]
-        fk_columns = {fk[3] for fk in schema['foreign_keys']}
+        # FK relationship info by column
+        fk_columns = _fk_map(table_name)
         
         # Create dict of current record
         current_record = dict(zip(column_names, record))
@@ -719,7 +1235,7 @@ def update_entry(table_name=None, uid=None, field_name=None):
         print("\nCurrent values:")
         for key, value in current_record.items():
             if key not in SYSTEM_FIELDS:
-                display_val = str(value)[:60] + "..." if value and len(str(value)) > 60 else value
+                display_val = _truncate(value)
                 print(f"  • {key}: {display_val}")
         print("=" * 70)
         
@@ -732,18 +1248,17 @@ def update_entry(table_name=None, uid=None, field_name=None):
             if field_name not in column_names:
                 print(f"❌ Field '{field_name}' does not exist in {table_name}")
                 cursor.close()
-                conn.close()
                 return False
             
             if _should_skip_field(table_name, field_name):
                 print(f"❌ Cannot update system or ignored field '{field_name}'")
                 cursor.close()
-                conn.close()
                 return False
             
             # Update this specific field
             updated_value = _update_single_field(table_name, field_name, current_record[field_name], 
-                                                 field_name in fk_columns, cursor)
+                                                 field_name in fk_columns, cursor,
+                                                 fk_columns.get(field_name))
             if updated_value is not None or updated_value != current_record[field_name]:
                 updates[field_name] = updated_value
                 any_updates = True
@@ -752,15 +1267,15 @@ def update_entry(table_name=None, uid=None, field_name=None):
             print("\n💡 Select fields to update (you can update multiple fields)")
             print("   Enter 'done' when finished, or 'cancel' to abort\n")
             
+            # Available fields (exclude system fields) don't change between prompts
+            updatable_fields = [col[1] for col in columns 
+                               if not _should_skip_field(table_name, col[1])]
+            
             while True:
-                # Show available fields (exclude system fields)
-                updatable_fields = [col[1] for col in columns 
-                                   if not _should_skip_field(table_name, col[1])]
-                
                 print("\nAvailable fields:")
                 for i, field in enumerate(updatable_fields, 1):
                     current_val = current_record[field]
-                    display_val = str(current_val)[:40] + "..." if current_val and len(str(current_val)) > 40 else current_val
+                    display_val = _truncate(current_val, 40)
                     updated_marker = " ✏️ [UPDATED]" if field in updates else ""
                     print(f"{i:2d}. {field}: {display_val}{updated_marker}")
                 
@@ -772,7 +1287,6 @@ def update_entry(table_name=None, uid=None, field_name=None):
                 elif choice == 'cancel':
                     print("Update cancelled.")
                     cursor.close()
-                    conn.close()
                     return False
                 elif choice.isdigit() and 1 <= int(choice) <= len(updatable_fields):
                     selected_field = updatable_fields[int(choice) - 1]
@@ -780,7 +1294,8 @@ def update_entry(table_name=None, uid=None, field_name=None):
                     # Update this field
                     updated_value = _update_single_field(table_name, selected_field, 
                                                          current_record[selected_field],
-                                                         selected_field in fk_columns, cursor)
+                                                         selected_field in fk_columns, cursor,
+                                                         fk_columns.get(selected_field))
                     
                     # Check if value actually changed
                     if updated_value != current_record[selected_field]:
@@ -797,7 +1312,6 @@ def update_entry(table_name=None, uid=None, field_name=None):
         if not any_updates:
             print("\n⚠️  No changes made - update cancelled")
             cursor.close()
-            conn.close()
             return False
         
         # Review changes and confirm
@@ -810,8 +1324,8 @@ def update_entry(table_name=None, uid=None, field_name=None):
         
         for field, new_value in updates.items():
             old_value = record[column_names.index(field)]
-            old_display = str(old_value)[:40] + "..." if old_value and len(str(old_value)) > 40 else old_value
-            new_display = str(new_value)[:40] + "..." if new_value and len(str(new_value)) > 40 else new_value
+            old_display = _truncate(old_value, 40)
+            new_display = _truncate(new_value, 40)
             
             print(f"  • {field}:")
             print(f"      Old: {old_display}")
@@ -823,40 +1337,39 @@ def update_entry(table_name=None, uid=None, field_name=None):
         if confirm != 'y':
             print("❌ Update cancelled")
             cursor.close()
-            conn.close()
             return False
         
         # Perform the update
-        set_clauses = [f"{field} = ?" for field in updates.keys()]
+        set_clauses = [f"{_q(field)} = ?" for field in updates.keys()]
         set_sql = ", ".join(set_clauses)
         values = list(updates.values()) + [uid]
         
-        update_query = f"UPDATE {table_name} SET {set_sql} WHERE UID = ?"
+        update_query = f"UPDATE {_q(table_name)} SET {set_sql} WHERE UID = ?"
+        cursor.execute("BEGIN IMMEDIATE")
         cursor.execute(update_query, values)
-        conn.commit()
+        cursor.execute("COMMIT")
         
         print(f"\n✅ Entry UID {uid} updated in {table_name}")
         print(f"   {len(updates)} field(s) modified")
         
         cursor.close()
-        conn.close()
         
         return True
         
     except sqlite3.IntegrityError as e:
+        _rollback_if_open(conn)
         print(f"\n❌ Cannot update: {e}")
         print("   (Constraint violation - check foreign keys and required fields)")
-        conn.rollback()
-        conn.close()
+        cursor.close()
         return False
     except Exception as e:
+        _rollback_if_open(conn)
         print(f"\n❌ Unexpected error: {e}")
-        conn.rollback()
-        conn.close()
+        cursor.close()
         return False
 
 
-def _update_single_field(table_name, field_name, current_value, is_foreign_key, cursor):
+def _update_single_field(table_name, field_name, current_value, is_foreign_key, cursor, fk_info=None):
     """
     Helper function to update a single field with appropriate handling for FKs.
     
@@ -866,6 +1379,7 @@ def _update_single_field(table_name, field_name, current_value, is_foreign_key,
         current_value: Current value of the field
         is_foreign_key: Whether this is a foreign key field
         cursor: Database cursor for FK lookups
+        fk_info: FK relationship info for the field, if already known
     
     Returns:
         New value for the field (or current_value if unchanged)
@@ -885,7 +1399,7 @@ def _update_single_field(table_name, field_name, current_value, is_foreign_key,
             return None
         elif change == 'y':
             # Use FK resolution
-            new_uid = _resolve_foreign_key(table_name, field_name)
+            new_uid = _resolve_foreign_key(table_name, field_name, fk_info)
             return new_uid if new_uid is not None else current_value
         else:
             print("   Invalid choice, keeping current value")
@@ -935,20 +1449,20 @@ def delete_entry(table_name=None, uid=None):
         
         print("=" * 70)
         
-        choice = input("\nSelect table (1-{}) or 'q' to quit: ".format(len(tables))).strip()
+        action = _parse_menu(input("\nSelect table (1-{}) or 'q' to quit: ".format(len(tables))), len(tables))
         
-        if choice.lower() == 'q':
+        if action[0] == 'cancel':
             print("Cancelled.")
             return False
         
-        if not choice.isdigit() or not (1 <= int(choice) <= len(tables)):
+        if action[0] != 'pick':
             print("❌ Invalid selection")
             return False
         
-        table_name = tables[int(choice) - 1]
+        table_name = tables[action[1]]
     
     # Verify table exists
-    if table_name not in _get_all_tables():
+    if not _table_exists(table_name):
         print(f"❌ Table '{table_name}' does not exist")
         return False
     
@@ -979,72 +1493,62 @@ def delete_entry(table_name=None, uid=None):
             _display_fk_results(results, table_name)
             
             # Get user selection
-            choice = input(f"\nSelect entry to delete (1-{len(results)}), search again (s), or cancel (c): ").strip().lower()
+            action = _parse_menu(input(f"\nSelect entry to delete (1-{len(results)}), search again (s), or cancel (c): "), len(results))
             
-            if choice == 's':
+            if action[0] == 'search':
                 continue
-            elif choice == 'c':
+            elif action[0] == 'cancel':
                 print("Cancelled.")
                 return False
-            elif choice.isdigit():
-                idx = int(choice) - 1
-                if 0 <= idx < len(results):
-                    uid = results[idx]['UID']
-                    break
-                else:
-                    print(f"   ❌ Invalid selection. Choose 1-{len(results)}")
+            elif action[0] == 'pick':
+                uid = results[action[1]]['UID']
+                break
             else:
-                print("   ❌ Invalid input")
+                print(f"   ❌ Invalid selection. Choose 1-{len(results)}")
     
     # Now we have table_name and uid - get full record details
-    conn = sqlite3.connect(database_path)
+    conn = _get_conn()
     cursor = conn.cursor()
     
     try:
         # Get the record
-        cursor.execute(f"SELECT * FROM {table_name} WHERE UID = ?", (uid,))
+        cursor.execute(_select_by_uid_sql(table_name), (uid,))
         record = cursor.fetchone()
         
         if not record:
             print(f"❌ No record found with UID {uid} in {table_name}")
             cursor.close()
-            conn.close()
             return False
         
-        # Get column names
-        cursor.execute(f"PRAGMA table_info({table_name})")
-        columns = cursor.fetchall()
-        column_names = [col[1] for col in columns]
+        # Get column names (from cached schema)
+        schema = _get_table_schema(table_name)
+        column_names = [col[1] for col in schema['columns']]
+        fk_by_col = _fk_map(table_name)
         
         # Create dict of record
         record_dict = dict(zip(column_names, record))
         
         # Check for related records (records that reference this UID via FK)
-        related_records = []
-        all_tables = _get_all_tables()
+        fk_pairs = [(other_table, fk_column)
+                    for other_table, fk_column in _get_fk_graph().get(table_name, [])
+                    if other_table != table_name]
         
-        for other_table in all_tables:
-            if other_table == table_name:
-                continue
-            
-            # Get foreign keys in the other table
-            cursor.execute(f"PRAGMA foreign_key_list({other_table})")
-            fks = cursor.fetchall()
+        # One UNION ALL query counts the references in every (table, column) pair
+        related_records = []
+        if fk_pairs:
+            count_sql = " UNION ALL ".join(
+                f"SELECT {i}, COUNT(*) FROM {_q(t)} WHERE {_q(c)} = ?"
+                for i, (t, c) in enumerate(fk_pairs)
+            )
+            cursor.execute(count_sql, [uid] * len(fk_pairs))
             
-            for fk in fks:
-                # fk structure: (id, seq, ref_table, from_col, to_col, on_update, on_delete, match)
-                if fk[2] == table_name:  # References our table
-                    # Check if any records in other_table reference this UID
-                    fk_column = fk[3]
-                    cursor.execute(f"SELECT COUNT(*) FROM {other_table} WHERE {fk_column} = ?", (uid,))
-                    count = cursor.fetchone()[0]
-                    
-                    if count > 0:
-                        related_records.append({
-                            'table': other_table,
-                            'column': fk_column,
-                            'count': count
-                        })
+            for i, count in sorted(cursor.fetchall(), key=lambda row: row[0]):
+                if count > 0:
+                    related_records.append({
+                        'table': fk_pairs[i][0],
+                        'column': fk_pairs[i][1],
+                        'count': count
+                    })
         
         # Display deletion warning with full details
         print("\n" + "=" * 70)
@@ -1055,43 +1559,46 @@ def delete_entry(table_name=None, uid=None):
         print(f"UID: {uid}\n")
         print("Fields:")
         
+        # Resolve FK values to display names: one query per referenced table
+        fk_values = {}      # {ref_table: {uid, ...}}
+        for key, value in record_dict.items():
+            if value is not None and key not in SYSTEM_FIELDS and key in fk_by_col:
+                fk_values.setdefault(fk_by_col[key]['ref_table'], set()).add(value)
+        
+        fk_display = {}     # {(ref_table, uid): display value, or None if nothing to show}
+        fk_failed = set()
+        for ref_table, ref_uids in fk_values.items():
+            # Only select the display candidates the referenced table actually has
+            ref_column_names = {col[1] for col in _get_table_schema(ref_table)['columns']}
+            display_cols = [f for f in ['Name_Arabic', 'Title', 'Nickname', 'Acronym', 'Author']
+                            if f in ref_column_names]
+            select_cols = ', '.join(_q(c) for c in ['UID'] + display_cols)
+            placeholders = ', '.join(['?' for _ in ref_uids])
+            try:
+                cursor.execute(f"SELECT {select_cols} FROM {_q(ref_table)} WHERE UID IN ({placeholders})",
+                               list(ref_uids))
+                for ref_row in cursor.fetchall():
+                    # First non-empty display field
+                    fk_display[(ref_table, ref_row[0])] = next((v for v in ref_row[1:] if v), None)
+            except sqlite3.Error:
+                fk_failed.add(ref_table)
+        
         # Display all non-null fields
         for key, value in record_dict.items():
             if value is not None and key not in SYSTEM_FIELDS:
                 # Truncate long values
-                display_val = str(value)[:60] + "..." if len(str(value)) > 60 else value
+                display_val = _truncate(value)
                 
-                # Try to resolve FK values to show meaningful info
-                schema = _get_table_schema(table_name)
-                fk_info = None
-                for fk in schema['foreign_keys']:
-                    if fk[3] == key:  # This is a FK column
-                        fk_info = {'ref_table': fk[2], 'ref_column': fk[4]}
-                        break
+                fk_info = fk_by_col.get(key)
                 
-                if fk_info:
-                    # Try to get display name from referenced table
-                    try:
-                        cursor.execute(f"SELECT * FROM {fk_info['ref_table']} WHERE UID = ?", (value,))
-                        ref_record = cursor.fetchone()
-                        if ref_record:
-                            cursor.execute(f"PRAGMA table_info({fk_info['ref_table']})")
-                            ref_columns = [col[1] for col in cursor.fetchall()]
-                            ref_dict = dict(zip(ref_columns, ref_record))
-                            
-                            # Find a good display field
-                            display_field = None
-                            for field in ['Name_Arabic', 'Title', 'Nickname', 'Acronym', 'Author']:
-                                if field in ref_dict and ref_dict[field]:
-                                    display_field = ref_dict[field]
-                                    break
-                            
-                            if display_field:
-                                print(f"  • {key}: {value} ({display_field})")
-                            else:
-                                print(f"  • {key}: {value}")
-                    except:
-                        print(f"  • {key}: {display_val}")
+                if fk_info and fk_info['ref_table'] not in fk_failed:
+                    # Show the referenced entry's display name, if it was found
+                    ref_key = (fk_info['ref_table'], value)
+                    if ref_key in fk_display:
+                        if fk_display[ref_key]:
+                            print(f"  • {key}: {value} ({fk_display[ref_key]})")
+                        else:
+                            print(f"  • {key}: {value}")
                 else:
                     print(f"  • {key}: {display_val}")
         
@@ -1112,31 +1619,29 @@ def delete_entry(table_name=None, uid=None):
         if confirm != "DELETE":
             print("❌ Deletion cancelled (confirmation did not match)")
             cursor.close()
-            conn.close()
             return False
         
-        # Perform the deletion
-        conn.execute("PRAGMA foreign_keys = ON")  # Ensure FK constraints are checked
-        cursor.execute(f"DELETE FROM {table_name} WHERE UID = ?", (uid,))
-        conn.commit()
+        # Perform the deletion (shared connection enforces FK constraints)
+        cursor.execute("BEGIN IMMEDIATE")
+        cursor.execute(f"DELETE FROM {_q(table_name)} WHERE UID = ?", (uid,))
+        cursor.execute("COMMIT")
         
         print(f"\n✅ Entry UID {uid} deleted from {table_name}")
         
         cursor.close()
-        conn.close()
         
         return True
         
     except sqlite3.IntegrityError as e:
         print(f"\n❌ Cannot delete: {e}")
         print("   (Foreign key constraint prevents deletion)")
-        conn.rollback()
-        conn.close()
+        _rollback_if_open(conn)
+        cursor.close()
         return False
     except Exception as e:
         print(f"\n❌ Unexpected error: {e}")
-        conn.rollback()
-        conn.close()
+        _rollback_if_open(conn)
+        cursor.close()
         return False
 
 
@@ -1146,9 +1651,11 @@ Display available functions on load
 
 print("\n💡 Available functions:")
 print("   • add_entry(table_name=None) - Add new entry to database")
+print("   • bulk_add(table_name, rows) - Add a list of entries in one transaction")
 print("   • update_entry(table_name=None, uid=None, field_name=None) - Update existing entry")
 print("   • delete_entry(table_name=None, uid=None) - Delete entry with safety checks")
 print("   • new_lex(new_term=None) - Streamlined lexicon entry with definition")
+print("   • build_search_index(table_name=None) - Build full-text indexes for faster search")
 print("\n📖 Quick start: add_entry() | update_entry() | delete_entry() | new_lex()")
 
 
@@ -1156,6 +1663,10 @@ print("\n📖 Quick start: add_entry() | update_entry() | delete_entry() | new_l
 Specialized Entry Functions
 """
 
+# Definition type menu choices for new_lex
+_DEF_TYPE_MAP = {'1': 'definition', '2': 'example', '3': 'note', '4': 'reference'}
+
+
 def new_lex(new_term=None):
     """
     Streamlined function for creating new lexicon entries with definitions.
@@ -1172,8 +1683,7 @@ def new_lex(new_term=None):
         new_lex('باج')               # Creates entry with term 'باج'
     """
     
-    conn = sqlite3.connect(database_path)
-    conn.execute("PRAGMA foreign_keys = ON")
+    conn = _get_conn()
     cursor = conn.cursor()
     
     try:
@@ -1188,14 +1698,10 @@ def new_lex(new_term=None):
             if not new_term:
                 print("❌ Term cannot be empty")
                 cursor.close()
-                conn.close()
                 return None
         else:
             print(f"\nNew lexicon item: {new_term}")
         
-        # Get next UID for lexicon
-        lex_uid = _get_next_uid('lexicon')
-        
         # Collect lexicon fields
         print("\n📝 Lexicon Fields")
         print("-" * 60)
@@ -1204,13 +1710,11 @@ def new_lex(new_term=None):
         transliteration = input("Transliteration: ").strip() or None
         translation = input("Translation: ").strip() or None
         
-        # Insert lexicon entry
-        cursor.execute("""
-            INSERT INTO lexicon (UID, Term, Emic_Term, Transliteration, Translation)
-            VALUES (?, ?, ?, ?, ?)
-        """, (lex_uid, new_term, emic_term, transliteration, translation))
+        # Entries are collected first and written together at the end; their
+        # UIDs are only known (and shown) once they have been saved
+        definitions = []
         
-        print(f"\n✅ Lexicon entry created (UID: {lex_uid})")
+        print("\n📝 Lexicon entry queued; it is saved with its definitions at the end")
         
         # Step 2: Add definition(s)
         while True:
@@ -1218,9 +1722,6 @@ def new_lex(new_term=None):
             print("📖 NEW DEFINITION")
             print("=" * 70)
             
-            # Get next UID for definition
-            def_uid = _get_next_uid('definitions')
-            
             # Select definition type
             print("\nDefinition Type:")
             print("1. definition")
@@ -1229,8 +1730,7 @@ def new_lex(new_term=None):
             print("4. reference")
             
             type_choice = input("\nSelect type (1-4): ").strip()
-            type_map = {'1': 'definition', '2': 'example', '3': 'note', '4': 'reference'}
-            def_type = type_map.get(type_choice, 'definition')
+            def_type = _DEF_TYPE_MAP.get(type_choice, 'definition')
             
             # Get definition text
             definition_text = input(f"\nDefinition ({def_type}): ").strip()
@@ -1254,39 +1754,81 @@ def new_lex(new_term=None):
             # Get Notes
             notes = input("\nNotes (optional): ").strip() or None
             
-            # Insert definition
-            cursor.execute("""
-                INSERT INTO definitions (UID, Lexicon_ID, Type, Definition, Source_ID, Page_No, Specificity, Notes)
-                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
-            """, (def_uid, lex_uid, def_type, definition_text, source_id, page_no, specificity, notes))
+            # Queue definition
+            definitions.append((def_type, definition_text, source_id, page_no, specificity, notes))
             
-            print(f"\n✅ Definition added (UID: {def_uid})")
+            print(f"\n📝 Definition {len(definitions)} queued")
             
             # Ask if user wants to add another definition
             another = input("\nAdd another definition for this term? (y/n): ").strip().lower()
             if another != 'y':
                 break
         
-        # Commit all changes
-        conn.commit()
+        # Write lexicon entry and all definitions in one short transaction
+        cursor.execute("BEGIN IMMEDIATE")
+        
+        if _uid_is_rowid('lexicon') and _uid_is_rowid('definitions'):
+            # INTEGER PRIMARY KEY: SQLite assigns the UIDs as the rows go in
+            cursor.execute("""
+                INSERT INTO lexicon (Term, Emic_Term, Transliteration, Translation)
+                VALUES (?, ?, ?, ?)
+            """, (new_term, emic_term, transliteration, translation))
+            lex_uid = cursor.lastrowid
+            cursor.executemany("""
+                INSERT INTO definitions (Lexicon_ID, Type, Definition, Source_ID, Page_No, Specificity, Notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?)
+            """, [(lex_uid,) + d for d in definitions])
+        else:
+            # Explicit UIDs, allocated while holding the write lock
+            lex_uid = _get_next_uid('lexicon')
+            base_def_uid = _get_next_uid('definitions')
+            cursor.execute("""
+                INSERT INTO lexicon (UID, Term, Emic_Term, Transliteration, Translation)
+                VALUES (?, ?, ?, ?, ?)
+            """, (lex_uid, new_term, emic_term, transliteration, translation))
+            cursor.executemany("""
+                INSERT INTO definitions (UID, Lexicon_ID, Type, Definition, Source_ID, Page_No, Specificity, Notes)
+                VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+            """, [(base_def_uid + i, lex_uid) + d for i, d in enumerate(definitions)])
+        
+        # The entry is new, so every definition pointing at it was just added
+        cursor.execute("SELECT UID FROM definitions WHERE Lexicon_ID = ? ORDER BY UID", (lex_uid,))
+        def_uids = [row[0] for row in cursor.fetchall()]
+        
+        cursor.execute("COMMIT")
         
         print("\n" + "=" * 70)
-        print(f"✅ Lexicon entry complete! (Lexicon UID: {lex_uid})")
+        print(f"✅ Lexicon entry created (UID: {lex_uid})")
+        for def_uid in def_uids:
+            print(f"✅ Definition added (UID: {def_uid})")
         print("=" * 70)
         
         cursor.close()
-        conn.close()
         
         return lex_uid
         
+    except KeyboardInterrupt:
+        print("\n❌ Cancelled: the lexicon entry and its definitions were not saved")
+        _rollback_if_open(conn)
+        cursor.close()
+        return None
+        
     except Exception as e:
         print(f"\n❌ Error creating lexicon entry: {e}")
-        conn.rollback()
+        print("   Nothing was saved")
+        _rollback_if_open(conn)
         cursor.close()
-        conn.close()
         return None
 
 
+# Author, Title and Gloss joined into one value so each row needs a single
+# REGEXP call; the newline separator keeps a term from matching across fields
+_BIB_SEARCH_TEXT = "(COALESCE(Author, '') || char(10) || COALESCE(Title, '') || char(10) || COALESCE(Gloss, ''))"
+
+# Selection prompt for bibliography search results
+_SOURCE_SELECT_PROMPT = "\n   Select (1-{n}), search again (s), or skip (Enter): "
+
+
 def _get_source_id_for_definition(cursor):
     """
     Helper function to get Source_ID for a definition.
@@ -1315,23 +1857,30 @@ def _get_source_id_for_definition(cursor):
                 print(f"   ❌ No bibliography entry with UID {source_uid}")
                 continue
         
-        # Otherwise, search bibliography
-        conn_temp = sqlite3.connect(database_path)
-        _register_regex_local(conn_temp)
-        cursor_temp = conn_temp.cursor()
-        
+        # Otherwise, search bibliography (the shared connection has REGEXP registered)
         normalized_term = _normalize_search_term(source_input)
         
-        cursor_temp.execute("""
-            SELECT UID, Author, Title, Gloss
-            FROM bibliography
-            WHERE Author REGEXP ? OR Title REGEXP ? OR Gloss REGEXP ?
-            LIMIT 20
-        """, (normalized_term, normalized_term, normalized_term))
+        # With a bibliography search index (see build_search_index), only the
+        # rows the index matches are checked with REGEXP
+        fts_term = _fts_match_term('bibliography', source_input, ['Author', 'Title', 'Gloss'])
         
-        results = cursor_temp.fetchall()
-        cursor_temp.close()
-        conn_temp.close()
+        if fts_term:
+            cursor.execute(f"""
+                SELECT UID, Author, Title, Gloss
+                FROM bibliography
+                WHERE UID IN (SELECT rowid FROM bibliography_fts WHERE bibliography_fts MATCH ?)
+                  AND {_BIB_SEARCH_TEXT} REGEXP ?
+                LIMIT 20
+            """, (fts_term, normalized_term))
+        else:
+            cursor.execute(f"""
+                SELECT UID, Author, Title, Gloss
+                FROM bibliography
+                WHERE {_BIB_SEARCH_TEXT} REGEXP ?
+                LIMIT 20
+            """, (normalized_term,))
+        
+        results = cursor.fetchall()
         
         if not results:
             print(f"   ❌ No matches found for '{source_input}'")
@@ -1341,38 +1890,51 @@ def _get_source_id_for_definition(cursor):
             continue
         
         # Display results (truncated for single line)
-        print(f"\n   Found {len(results)} sources:")
+        lines = [f"\n   Found {len(results)} sources:"]
         for i, (uid, author, title, gloss) in enumerate(results, 1):
-            # Truncate fields for single-line display
-            author_short = (author[:15] + "...") if author and len(author) > 15 else (author or "")
-            title_short = (title[:25] + "...") if title and len(title) > 25 else (title or "")
-            gloss_short = (gloss[:15] + "...") if gloss and len(gloss) > 15 else (gloss or "")
-            
-            # Build display line
-            display_parts = [p for p in [author_short, title_short, gloss_short] if p]
-            display = " - ".join(display_parts)
-            
-            print(f"   {i:2d}. [{uid:4d}] {display}")
+            # Truncate fields for single-line display, skipping empty ones
+            display_parts = [_truncate(value, n) for value, n in ((author, 15), (title, 25), (gloss, 15)) if value]
+            lines.append(f"   {i:2d}. [{uid:4d}] {' - '.join(display_parts)}")
+        
+        # One write for the whole list
+        print("\n".join(lines))
         
         # Get selection
-        choice = input(f"\n   Select (1-{len(results)}), search again (s), or skip (Enter): ").strip().lower()
+        action = _parse_menu(input(_SOURCE_SELECT_PROMPT.format(n=len(results))), len(results))
         
-        if choice == 's':
+        if action[0] == 'search':
             continue
-        elif not choice:
+        elif action[0] == 'empty':
             return None
-        elif choice.isdigit():
-            idx = int(choice) - 1
-            if 0 <= idx < len(results):
-                return results[idx][0]  # Return UID
-            else:
-                print(f"   ❌ Invalid selection")
+        elif action[0] == 'pick':
+            return results[action[1]][0]  # Return UID
+        else:
+            print(f"   ❌ Invalid selection")
+
+
+# Specificity tokens seen in definitions, loaded once per session
+_SPECIFICITY_TOKENS = None
+
+
+def _load_specificity_tokens(cursor):
+    """Get the set of existing space-separated Specificity tokens (cached)"""
+    global _SPECIFICITY_TOKENS
+    if _SPECIFICITY_TOKENS is None:
+        # Get all existing specificity values
+        cursor.execute("SELECT DISTINCT Specificity FROM definitions WHERE Specificity IS NOT NULL")
+        
+        # Tokenize them (split by spaces)
+        _SPECIFICITY_TOKENS = set()
+        for (value,) in cursor.fetchall():
+            if value:
+                _SPECIFICITY_TOKENS.update(value.split())
+    return _SPECIFICITY_TOKENS
 
 
 def _get_specificity_selection(cursor):
     """
     Helper function to get Specificity value(s) from tokenized existing values.
-    Allows multi-select from existing space-separated tokens.
+    Allows multi-select from existing space-separated tokens, plus new values.
     
     Args:
         cursor: Database cursor
@@ -1380,21 +1942,15 @@ def _get_specificity_selection(cursor):
     Returns:
         str: Space-separated specificity values, or None if skipped
     """
-    # Get all existing specificity values
-    cursor.execute("SELECT DISTINCT Specificity FROM definitions WHERE Specificity IS NOT NULL")
-    all_values = cursor.fetchall()
-    
-    # Tokenize them (split by spaces)
-    tokens = set()
-    for (value,) in all_values:
-        if value:
-            # Split on spaces and add each token
-            tokens.update(value.split())
+    tokens = _load_specificity_tokens(cursor)
     
     if not tokens:
         # No existing values, allow free entry
         print("\nSpecificity (no existing values, free entry):")
-        return input("Specificity: ").strip() or None
+        value = input("Specificity: ").strip() or None
+        if value:
+            tokens.update(value.split())
+        return value
     
     # Display tokens for selection
     tokens_list = sorted(tokens)
@@ -1403,7 +1959,7 @@ def _get_specificity_selection(cursor):
     for i, token in enumerate(tokens_list, 1):
         print(f"   {i:2d}. {token}")
     
-    print("\n   Enter numbers separated by spaces (e.g., '1 3 5')")
+    print("\n   Enter numbers separated by spaces (e.g., '1 3 5'), or type new values")
     print("   Or press Enter to skip")
     
     selection = input("   Selection: ").strip()
@@ -1411,19 +1967,24 @@ def _get_specificity_selection(cursor):
     if not selection:
         return None
     
-    # Parse selection
+    # Parse selection (numbers pick existing tokens, anything else is a new value)
     selected_tokens = []
     for num in selection.split():
         if num.isdigit():
-            idx = int(num) - 1
-            if 0 <= idx < len(tokens_list):
-                selected_tokens.append(tokens_list[idx])
+            action = _parse_menu(num, len(tokens_list))
+            if action[0] == 'pick':
+                selected_tokens.append(tokens_list[action[1]])
             else:
                 print(f"   ⚠️  Skipping invalid selection: {num}")
+        else:
+            selected_tokens.append(num)
     
     if not selected_tokens:
         return None
     
+    # Offer new values in later prompts without re-querying
+    tokens.update(selected_tokens)
+    
     # Join with spaces
     return " ".join(selected_tokens)
 
@@ -1700,7 +2261,7 @@ def _select_from_tokenized_values(cursor, table, column, allow_multi=True, delim
     Returns:
         str: Selected token(s) joined by delimiter, or None if skipped
     """
-    cursor.execute(f"SELECT DISTINCT {column} FROM {table} WHERE {column} IS NOT NULL")
+    cursor.execute(f"SELECT DISTINCT {_q(column)} FROM {_q(table)} WHERE {_q(column)} IS NOT NULL")
     all_values = cursor.fetchall()
 
     tokens = set()
@@ -1764,7 +2325,7 @@ def _get_tags_input(cursor, table='bibliography', column='Tags', top_n=10):
         User types: "edited, petition, Sanad"
         Stored as:  "edited petition Sanad"
     """
-    cursor.execute(f"SELECT {column} FROM {table} WHERE {column} IS NOT NULL")
+    cursor.execute(f"SELECT {_q(column)} FROM {_q(table)} WHERE {_q(column)} IS NOT NULL")
     all_values = cursor.fetchall()
 
     freq = {}
@@ -2061,7 +2622,7 @@ def new_bib(mode=None):
         print("=" * 70)
         for key, value in entry_data.items():
             if value is not None:
-                display_val = str(value)[:60] + "..." if len(str(value)) > 60 else value
+                display_val = _truncate(value)
                 print(f"  • {key}: {display_val}")
             else:
                 print(f"  • {key}: NULL")
@@ -4,8 +4,19 @@ Library of functions for querying Eurasia database
 """
 
 import sqlite3, os
-import pandas as pd
+import array
+import atexit
+import threading
+from concurrent.futures import ThreadPoolExecutor
+from urllib.parse import quote
+from functools import lru_cache
+from itertools import chain, groupby
+from operator import itemgetter
 import re
+try:
+    import re2 as _re2   # optional: pip install google-re2 (see use_re2 below)
+except ImportError:
+    _re2 = None
 from datetime import datetime
 import pyperclip
 
@@ -21,30 +32,237 @@ inbox_path = os.path.join(hdir, 'Dropbox/Active_Directories/Inbox')
 
 database_path = os.path.join(hdir, dh_path.strip('/'), 'database_eurasia_7.0.db')
 
+# Set to True to evaluate REGEXP inside SQLite with the sqlite-regex extension
+# (pip install sqlite-regex) instead of calling back into Python's re per row.
+# Faster, but patterns follow Rust regex syntax: no lookarounds or backreferences.
+# Set before the first search: search SQL is built and cached accordingly.
+use_sqlite_regex = False
+
+# Set to True to run Python-side REGEXP patterns through RE2 (pip install
+# google-re2), which matches in linear time with no catastrophic backtracking.
+# Patterns RE2 can't handle (lookarounds, backreferences) still use re. Note
+# RE2's \w, \d and \b are ASCII-only, so they won't match Arabic script.
+# Set before the first search: compiled patterns are cached.
+use_re2 = False
+
 
 # Check if database file exists
 if not os.path.exists(database_path):
     raise FileNotFoundError(f"Database file not found at: {database_path}")
 
-# Connect to the SQLite database
-conn = sqlite3.connect(database_path)
+# Shared connection, opened lazily on first use and reused by every query
+_conn = None
+# Per-thread read-only connections for parallel table scans (see _get_ro_conn),
+# run on one worker pool kept for the life of the process so the connections
+# (and their prepared statements) outlive a single search
+_ro_local = threading.local()
+_ro_conns = []
+_ro_lock = threading.Lock()
+_pool = None
+_optimized = False
+
+
+def _optimize_once():
+    """Let SQLite refresh planner statistics once per process (needs 3.18+)."""
+    global _optimized
+    if _optimized or _conn is None or sqlite3.sqlite_version_info < (3, 18, 0):
+        return
+    _optimized = True
+    try:
+        _conn.execute("PRAGMA optimize")
+    except sqlite3.Error:
+        pass
 
-# Create a cursor object to execute SQL commands
-cursor = conn.cursor()
 
-try:
-    # Your database operations will go here
-    pass
-finally:
-    # Always close the connection when done
-    cursor.close()
-    conn.close()
+def _close_conn():
+    global _conn
+    if _conn is not None:
+        if sqlite3.sqlite_version_info >= (3, 18, 0):
+            try:
+                _conn.execute("PRAGMA optimize")
+            except sqlite3.Error:
+                pass
+        _conn.close()
+        _conn = None
+
+
+def _close_ro_conns():
+    global _pool
+    if _pool is not None:
+        _pool.shutdown(wait=True)
+        _pool = None
+    with _ro_lock:
+        for conn in _ro_conns:
+            conn.close()
+        _ro_conns.clear()
+
+
+def _get_conn():
+    """Return the module's shared connection, opening and tuning it on first use."""
+    global _conn
+    if _conn is None:
+        # Autocommit mode: searches open their own read transaction explicitly
+        _conn = sqlite3.connect(database_path, isolation_level=None, cached_statements=256)
+        for pragma in (
+            "PRAGMA journal_mode = WAL",
+            "PRAGMA synchronous = NORMAL",
+            "PRAGMA temp_store = MEMORY",
+            "PRAGMA cache_size = -64000",
+            "PRAGMA mmap_size = 30000000000",
+        ):
+            _conn.execute(pragma)
+        _register_regex(_conn)
+        _ensure_search_indexes(_conn)
+        atexit.register(_close_conn)
+    return _conn
+
+
+# Composite indexes matching the joins in word_search and location_search,
+# so related rows can be read from the index alone. Each is skipped when its
+# leading column already leads another index (e.g. one of the foreign key
+# indexes database_crud_functions creates), so a column is indexed once.
+_SEARCH_INDEXES = (
+    ('idx_rt_parent', 'related_terms', ('Parent_ID', 'Child_ID', 'Type')),
+    ('idx_rt_child', 'related_terms', ('Child_ID', 'Parent_ID')),
+    ('idx_lh_child', 'location_hierarchies', ('Child_ID', 'Parent_ID', 'Relationship')),
+    ('idx_lh_parent', 'location_hierarchies', ('Parent_ID', 'Child_ID')),
+)
+
+# Indexes earlier versions created that no query uses any more; dropped so
+# they stop costing every write
+_RETIRED_INDEXES = ('idx_lex_sortlen', 'idx_gaz_sortlen', 'idx_def_lex')
+
+
+def _q(identifier):
+    """Quote a table or column name for use in SQL (doubles embedded quotes)"""
+    return '"' + identifier.replace('"', '""') + '"'
+
+
+def _ensure_search_indexes(conn):
+    """Create any missing search indexes and gather planner statistics for them."""
+    existing = {row[0] for row in conn.execute("SELECT name FROM sqlite_master WHERE type = 'index'")}
+    analyze = set()
+    
+    for index_name in _RETIRED_INDEXES:
+        if index_name in existing:
+            conn.execute(f"DROP INDEX IF EXISTS {_q(index_name)}")
+    
+    # Index names by (table, leading column)
+    leading = {}
+    for table, column, index_name in conn.execute("""
+        SELECT m.name, ii.name, il.name
+        FROM sqlite_master m, pragma_index_list(m.name) il, pragma_index_info(il.name) ii
+        WHERE m.type = 'table' AND ii.seqno = 0
+    """):
+        leading.setdefault((table, column), set()).add(index_name)
+    
+    for index_name, table, columns in _SEARCH_INDEXES:
+        others = leading.get((table, columns[0]), set()) - {index_name}
+        if others:
+            # Another index already covers the column; drop a duplicate an
+            # earlier version of this module created alongside it
+            if index_name in existing:
+                conn.execute(f"DROP INDEX IF EXISTS {_q(index_name)}")
+            continue
+        if index_name in existing:
+            continue
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {_q(index_name)} ON {_q(table)}({', '.join(_q(c) for c in columns)})")
+            leading.setdefault((table, columns[0]), set()).add(index_name)
+            analyze.add(table)
+        except sqlite3.OperationalError:
+            # Table or column not present in this database
+            continue
+    
+    # Junction and definition lookups driven by TABLE_SEARCH_CONFIG, unless
+    # the column already leads an index (e.g. one of the composites above)
+    for table, column in _config_index_columns():
+        if (table, column) in leading:
+            continue
+        try:
+            conn.execute(f"CREATE INDEX IF NOT EXISTS {_q(f'idx_{table}_{column}')} ON {_q(table)}({_q(column)})")
+            analyze.add(table)
+        except sqlite3.OperationalError:
+            continue
+    
+    for table in sorted(analyze):
+        conn.execute(f"ANALYZE {_q(table)}")
+
+def _config_index_columns():
+    """(table, column) pairs that gen_search's related-record lookups filter or join on"""
+    pairs = {('location_attributes', 'Location_ID')}
+    for config in TABLE_SEARCH_CONFIG.values():
+        for rel in config.get('related_tables', []):
+            pairs.add((rel['junction_table'], rel['junction_fk']))
+            pairs.add((rel['junction_table'], rel['target_fk']))
+        if 'definitions_table' in config:
+            pairs.add((config['definitions_table'], config['definitions_fk']))
+    return sorted(pairs)
+
+def _table_info(table_name):
+    """
+    Return PRAGMA table_info rows for a table, read once per schema version.
+    
+    Keyed on PRAGMA schema_version, so columns added or renamed (e.g. by
+    the editing library) are picked up on the next call.
+    """
+    schema_version = _get_conn().execute("PRAGMA schema_version").fetchone()[0]
+    return _schema_at(schema_version)[0].get(table_name.lower(), ())
+
+def _foreign_key_list(table_name):
+    """Return PRAGMA foreign_key_list rows for a table, read once per schema version."""
+    schema_version = _get_conn().execute("PRAGMA schema_version").fetchone()[0]
+    return _schema_at(schema_version)[1].get(table_name.lower(), ())
+
+@lru_cache(maxsize=4)
+def _schema_at(schema_version):
+    """
+    Read table_info and foreign_key_list for every table and view in two
+    queries (via the pragma table-valued functions) rather than two PRAGMAs
+    per table. Keys are lower-cased, as SQLite table names are case-insensitive.
+    
+    Returns:
+        tuple: ({table: table_info rows}, {table: foreign_key_list rows})
+    """
+    conn = _get_conn()
+    schema = []
+    for pragma, order in (('pragma_table_info', 'p.cid'), ('pragma_foreign_key_list', 'p.id, p.seq')):
+        rows = conn.execute(f"""
+            SELECT m.name, p.*
+            FROM sqlite_master m, {pragma}(m.name) p
+            WHERE m.type IN ('table', 'view')
+            ORDER BY m.name, {order}
+        """)
+        schema.append({name.lower(): tuple(row[1:] for row in group)
+                       for name, group in groupby(rows, key=itemgetter(0))})
+    return tuple(schema)
+
+def _table_names():
+    """
+    Return the database's user tables in name order, read once per schema version.
+    
+    Skips full-text index tables ({table}_fts and their shadow tables) and
+    SQLite's internal tables (sqlite_sequence, sqlite_stat1).
+    """
+    schema_version = _get_conn().execute("PRAGMA schema_version").fetchone()[0]
+    return _table_names_at(schema_version)
+
+@lru_cache(maxsize=4)
+def _table_names_at(schema_version):
+    return tuple(row[0] for row in _get_conn().execute("""
+        SELECT name FROM sqlite_master
+        WHERE type='table' AND name NOT LIKE '%\\_fts%' ESCAPE '\\'
+          AND name NOT LIKE 'sqlite\\_%' ESCAPE '\\'
+        ORDER BY name;
+    """))
 
 """Display Configuration Etc
 """
 
 def _configure_display():
     """Configure pandas display options for better terminal viewing"""
+    # Imported here so the search functions don't pay for loading pandas
+    import pandas as pd
     pd.set_option('display.max_columns', None)
     pd.set_option('display.width', None) 
     pd.set_option('display.max_colwidth', 80)
@@ -69,8 +287,7 @@ def database_info(table_name=None, show_columns=False):
         database_info('lexicon', True)     # Show lexicon table with full column details
         database_info(show_columns=True)   # Show all tables with full column details
     """
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     try:
         if table_name:
@@ -78,35 +295,23 @@ def database_info(table_name=None, show_columns=False):
             _show_table_info(cursor, table_name, show_columns)
         else:
             # Show info for all tables
-            cursor.execute("""
-                SELECT name 
-                FROM sqlite_master 
-                WHERE type='table'
-                ORDER BY name;
-            """)
-            tables = cursor.fetchall()
-            
             print("📊 Database Tables Overview:")
             print("=" * 50)
             
-            for table in tables:
-                _show_table_info(cursor, table[0], show_columns)
+            for table in _table_names():
+                _show_table_info(cursor, table, show_columns)
                 
     finally:
         cursor.close()
-        conn.close()
 
 def _show_table_info(cursor, table_name, show_columns=False):
     """Helper function to display information about a single table"""
     try:
         # Get basic table info
-        cursor.execute(f"PRAGMA table_info({table_name});")
-        columns_info = cursor.fetchall()
+        columns_info = _table_info(table_name)
         num_columns = len(columns_info)
 
-        cursor.execute(f"PRAGMA foreign_key_list({table_name});")
-        foreign_keys = cursor.fetchall()
-        foreign_keys_info = [fk[3] for fk in foreign_keys]
+        foreign_keys_info = [fk[3] for fk in _foreign_key_list(table_name)]
 
         print(f"📋 {table_name}: {num_columns} columns, FK: {foreign_keys_info}")
         
@@ -148,8 +353,7 @@ def validate_search_config(table_name=None, verbose=True):
         - To debug search errors
         - Before deploying config changes
     """
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     # Import TABLE_SEARCH_CONFIG from the module scope
     # (If this errors, TABLE_SEARCH_CONFIG hasn't been defined yet)
@@ -167,8 +371,7 @@ def validate_search_config(table_name=None, verbose=True):
             config = TABLE_SEARCH_CONFIG[table]
             
             # Get actual columns from database
-            cursor.execute(f"PRAGMA table_info({table});")
-            table_columns = {col[1] for col in cursor.fetchall()}  # Use set for fast lookup
+            table_columns = {col[1] for col in _table_info(table)}  # Use set for fast lookup
             
             if verbose:
                 print(f"\n{'='*70}")
@@ -211,8 +414,7 @@ def validate_search_config(table_name=None, verbose=True):
                     ref_table = fk_config['table']
                     ref_field = fk_config['display_field']
                     
-                    cursor.execute(f"PRAGMA table_info({ref_table});")
-                    ref_columns = {col[1] for col in cursor.fetchall()}
+                    ref_columns = {col[1] for col in _table_info(ref_table)}
                     
                     if ref_field in ref_columns:
                         valid_fks.append(f"{fk_column} → {ref_table}.{ref_field}")
@@ -281,33 +483,7 @@ def validate_search_config(table_name=None, verbose=True):
         return {}
     finally:
         cursor.close()
-        conn.close()
-
-
-def _show_table_info(cursor, table_name, show_columns=False):
-    """Helper function to display information about a single table"""
-    try:
-        # Get basic table info
-        cursor.execute(f"PRAGMA table_info({table_name});")
-        columns_info = cursor.fetchall()
-        num_columns = len(columns_info)
 
-        cursor.execute(f"PRAGMA foreign_key_list({table_name});")
-        foreign_keys = cursor.fetchall()
-        foreign_keys_info = [fk[3] for fk in foreign_keys]
-
-        print(f"📋 {table_name}: {num_columns} columns, FK: {foreign_keys_info}")
-        
-        if show_columns:
-            print("   Columns:")
-            for col in columns_info:
-                col_name, col_type, not_null, default, pk = col[1], col[2], col[3], col[4], col[5]
-                pk_indicator = " (PK)" if pk else ""
-                print(f"     • {col_name} ({col_type}){pk_indicator}")
-            print()
-            
-    except Exception as e:
-        print(f"❌ Error examining table {table_name}: {e}")
 
 """
 Database Query Functions
@@ -317,22 +493,20 @@ def get_unique_values(table_name, column_name):
     """
     Retrieve a list of all unique values in the specified column of a table.
     """
-    # Establish a connection to the database using the database_path
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    # Only names found in the (cached) schema are put into the SQL
+    table_columns = {col[1] for col in _table_info(table_name)}
+    if not table_columns:
+        print(f"❌ Table '{table_name}' not found")
+        return []
+    if column_name not in table_columns:
+        print(f"❌ Column '{column_name}' not found in {table_name}")
+        return []
     
     # Query to select distinct values from the specified column
-    query = f"SELECT DISTINCT {column_name} FROM {table_name};"
-    cursor.execute(query)
-    
-    # Fetch all unique values
-    unique_values = [row[0] for row in cursor.fetchall()]
+    query = f'SELECT DISTINCT "{column_name}" FROM "{table_name}";'
     
-    # Close the cursor and connection
-    cursor.close()
-    conn.close()
-    
-    return unique_values
+    # Read values straight off the cursor rather than via a fetchall() list
+    return [row[0] for row in _get_conn().execute(query)]
 
 
 """
@@ -341,20 +515,353 @@ Series of functions that allow regex querying of lexicon-related tables in the d
 
 
 
+# Compile each pattern once; SQLite calls REGEXP per row and per column.
+# An invalid pattern is cached as None so it is reported once, not per row.
+@lru_cache(maxsize=1024)
+def _compile_pattern(pattern):
+    if use_re2 and _re2 is not None:
+        try:
+            return _re2.compile(pattern)
+        except _re2.error:
+            pass
+    try:
+        return re.compile(pattern)
+    except re.error as e:
+        print(f"Regex error: {e}")
+        return None
+
 # Function to enable regex in SQLite
 def _regex_search(pattern, string):
-    # Check if the string is valid
-    if not isinstance(string, str):
+    # Empty cells are treated as non-matching, deliberately: '' would match
+    # patterns like ^$ or .* in Python, but an empty cell is not a hit.
+    # NULLs and non-text values never match either. The SQL-side shortcuts
+    # (the col != '' guards and _MATCH_ALL_PATTERNS) rely on this rule.
+    if not string or not isinstance(string, str):
         return False
-    try:
-        return re.search(pattern, string) is not None
-    except Exception as e:
-        print(f"Regex error: {e}")
+    compiled = _compile_pattern(pattern)
+    return compiled is not None and compiled.search(string) is not None
+
+# REGEXP_ANY(pattern, col1, col2, ...): true if any column matches. Testing
+# all of a row's columns in one callback saves a Python call per column.
+# Empty cells never match, as in _regex_search
+def _regex_search_any(pattern, *strings):
+    compiled = _compile_pattern(pattern)
+    if compiled is None:
         return False
+    return any(string and isinstance(string, str) and compiled.search(string) is not None
+               for string in strings)
+
+def _regexp_any_sql(columns, param):
+    """
+    SQL testing one pattern parameter against several columns: a single
+    REGEXP_ANY call, or per-column REGEXP when sqlite-regex provides REGEXP
+    (REGEXP_ANY is always the Python implementation). param is a named
+    placeholder such as ':term', so it is bound once either way. The
+    col != '' guard keeps sqlite-regex in line with _regex_search, where
+    empty cells never match.
+    
+    Returns:
+        str: SQL condition
+    """
+    if use_sqlite_regex:
+        return "(" + " OR ".join(f"({col} != '' AND {col} REGEXP {param})" for col in columns) + ")"
+    return f"REGEXP_ANY({param}, {', '.join(columns)})"
 
 # Register the regex function with SQLite
 def _register_regex(conn):
-    conn.create_function("REGEXP", 2, _regex_search)
+    conn.create_function("REGEXP_ANY", -1, _regex_search_any, deterministic=True)
+    if use_sqlite_regex:
+        try:
+            import sqlite_regex
+            conn.enable_load_extension(True)
+            sqlite_regex.load(conn)
+            conn.enable_load_extension(False)
+            return
+        except (ImportError, AttributeError, sqlite3.Error) as e:
+            print(f"⚠️  sqlite-regex unavailable ({e}); using Python regex")
+    conn.create_function("REGEXP", 2, _regex_search, deterministic=True)
+
+# Characters that make a search term a real regex rather than a literal
+_REGEX_META_RE = re.compile(r'[.^$*+?{}\[\]\\|()]')
+
+# "List everything" patterns: they match any non-empty text value, because
+# REGEXP treats empty cells as non-matching (see _regex_search)
+_MATCH_ALL_PATTERNS = frozenset({'', '.*', '^', '^.*'})
+
+def _fts_match_term(search_term):
+    """
+    FTS5 phrase that every match of a search term must contain: the term
+    itself if it is a literal, otherwise the regex's longest required
+    literal run. None if that is shorter than 3 characters (the trigram
+    index can't look it up).
+    """
+    literal = _longest_literal(search_term) if _REGEX_META_RE.search(search_term) else search_term
+    if len(literal) < 3:
+        return None
+    return '"' + literal.replace('"', '""') + '"'
+
+def _fts_covers(table_name, columns):
+    """True if the table's {table}_fts index exists and covers all the columns"""
+    fts_columns = {col[1] for col in _table_info(f"{table_name}_fts")}
+    return bool(fts_columns) and set(columns) <= fts_columns
+
+def _fts_prefilter(cursor, table_name, uid_column, search_term, columns, name='match'):
+    """
+    Narrow a REGEXP search to rows the table's FTS5 index says can match.
+    
+    Uses the trigram {table}_fts index built by build_search_index() in
+    database_crud_functions. Literal terms, and regexes with a required
+    literal run, qualify when that text is 3+ characters; the index matches
+    case-insensitively, so the REGEXP filter still decides the final
+    (case-sensitive) match. The MATCH text is bound as the named parameter
+    :{name}.
+    
+    Returns:
+        tuple: (SQL condition ending in AND, params dict), or ("", {}) if the
+               index is missing, stale, or the term has no usable literal
+    """
+    match_term = _fts_match_term(search_term)
+    if match_term is None or not _fts_covers(table_name, columns):
+        return "", {}
+    
+    fts_table = f"{table_name}_fts"
+    return f"{uid_column} IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :{name}) AND ", {name: match_term}
+
+# Inline flags such as (?i) or (?x) change what the literal text matches
+_INLINE_FLAGS_RE = re.compile(r'\(\?[aiLmsux-]+[:)]')
+_QUANTIFIER_RE = re.compile(r'\{\d*(?:,\d*)?\}')
+
+def _longest_literal(pattern):
+    """
+    Longest run of plain characters that every match of a regex must contain.
+    
+    Read from the pattern text: groups, character classes, anchors, '.' and
+    escapes like \d end a run, and a quantifier drops the character it
+    applies to. Returns '' when no such run can be found safely (alternation
+    at the top level or inline flags).
+    """
+    if _INLINE_FLAGS_RE.search(pattern):
+        return ''
+    
+    runs, run = [], ''
+    i, n = 0, len(pattern)
+    while i < n:
+        ch = pattern[i]
+        if ch == '\\':
+            nxt = pattern[i + 1:i + 2]
+            if nxt and not nxt.isalnum():
+                # Escaped punctuation (\. \( ...) is a literal character
+                run += nxt
+            else:
+                runs.append(run)
+                run = ''
+            i += 2
+            continue
+        if ch == '|':
+            return ''
+        if ch in '*+?' or (ch == '{' and _QUANTIFIER_RE.match(pattern, i)):
+            # The previous character is optional or repeated, so it can't be
+            # part of a required run
+            runs.append(run[:-1])
+            run = ''
+            i = _QUANTIFIER_RE.match(pattern, i).end() if ch == '{' else i + 1
+            continue
+        if ch == '(':
+            i = _skip_group(pattern, i)
+        elif ch == '[':
+            i = _skip_class(pattern, i)
+        elif ch in '.^$)':
+            i += 1
+        else:
+            run += ch
+            i += 1
+            continue
+        runs.append(run)
+        run = ''
+    runs.append(run)
+    return max(runs, key=len)
+
+def _skip_class(pattern, i):
+    """Index just past the character class starting at pattern[i] ('[')"""
+    i += 1
+    if pattern[i:i + 1] == '^':
+        i += 1
+    if pattern[i:i + 1] == ']':
+        i += 1
+    while i < len(pattern) and pattern[i] != ']':
+        i += 2 if pattern[i] == '\\' else 1
+    return i + 1
+
+def _skip_group(pattern, i):
+    """Index just past the group starting at pattern[i] ('('), nesting included"""
+    depth = 0
+    while i < len(pattern):
+        ch = pattern[i]
+        if ch == '\\':
+            i += 2
+            continue
+        if ch == '[':
+            i = _skip_class(pattern, i)
+            continue
+        if ch == '(':
+            depth += 1
+        elif ch == ')':
+            depth -= 1
+            if depth == 0:
+                return i + 1
+        i += 1
+    return i
+
+def _regexp_clause(columns, pattern, name='term'):
+    """
+    Build the condition "any of these columns matches pattern".
+    
+    A pattern with no regex syntax at all is a plain substring test, so it
+    is run as instr() entirely inside SQLite. Otherwise the columns are
+    tested with one REGEXP_ANY call per row; when the pattern contains a
+    required literal, that call is guarded by a LIKE on the literal so
+    SQLite discards most rows before calling back into Python. LIKE ignores
+    ASCII case, so the regex still decides the match.
+    
+    The pattern is bound once as the named parameter :{name} (and the LIKE
+    text as :{name}_like) however many columns refer to it, so callers
+    combining several clauses give each its own name. Patterns that match
+    any non-empty text ('', '.*') need no regex at all.
+    
+    Returns:
+        tuple: (SQL condition, params dict)
+    """
+    if pattern in _MATCH_ALL_PATTERNS:
+        return "(" + " OR ".join(f"(typeof({col}) = 'text' AND {col} != '')" for col in columns) + ")", {}
+    
+    if pattern and not _REGEX_META_RE.search(pattern):
+        return "(" + " OR ".join(f"instr({col}, :{name}) > 0" for col in columns) + ")", {name: pattern}
+    
+    regexp_sql = _regexp_any_sql(columns, f':{name}')
+    literal = _longest_literal(pattern)
+    if not literal:
+        return regexp_sql, {name: pattern}
+    
+    # A column matching the regex contains the literal, so requiring some
+    # column to LIKE it never drops a match
+    like = '%' + re.sub(r'([\\%_])', r'\\\1', literal) + '%'
+    like_sql = " OR ".join(f"{col} LIKE :{name}_like ESCAPE '\\'" for col in columns)
+    return f"(({like_sql}) AND {regexp_sql})", {name: pattern, f'{name}_like': like}
+
+def _load_match_uids(cursor, uids):
+    """
+    Store matched UIDs in the TEMP table _match_uid so follow-up queries can
+    join against it instead of re-sending an IN (...) list each time.
+    """
+    cursor.execute("CREATE TEMP TABLE IF NOT EXISTS _match_uid (uid INTEGER PRIMARY KEY)")
+    cursor.execute("DELETE FROM _match_uid")
+    cursor.executemany("INSERT OR IGNORE INTO _match_uid VALUES (?)", [(uid,) for uid in uids])
+
+def _uid_key(value):
+    """
+    Normalize a foreign key value to the integer UID it refers to, as the
+    INTEGER PRIMARY KEY comparison would (12, 12.0 and '12' all give 12).
+    
+    Returns:
+        int, or None if the value can't name a UID
+    """
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, int):
+        return value
+    if isinstance(value, float):
+        return int(value) if value.is_integer() else None
+    if isinstance(value, str) and re.fullmatch(r'\s*[+-]?\d+\s*', value):
+        return int(value)
+    return None
+
+def _window_rows(cursor, max_results):
+    """
+    Read an executed query whose last column is COUNT(*) OVER () without
+    fetching it all first: the first row gives the total, and the rest can
+    be streamed off the cursor.
+    
+    Returns:
+        tuple: (row iterator, number of rows it yields, total matches)
+    """
+    first = cursor.fetchone()
+    if first is None:
+        return iter(()), 0, 0
+    total = first[-1]
+    shown = min(total, max_results) if max_results else total
+    return chain([first], cursor), shown, total
+
+# Follow-up queries for word_search and location_search. The SQL text never
+# changes between calls (UIDs come from _match_uid; LIMIT -1 means no limit),
+# so sqlite3's statement cache reuses the prepared statements.
+
+_WORD_DETAIL_SQL = """
+    SELECT 
+        l.UID,
+        l.Term,
+        l.Translation,
+        l.Emic_Term,
+        l.Colonial_Term,
+        l.Transliteration,
+        l.Etymology,
+        l.Scope,
+        l.Tags,
+        GROUP_CONCAT(COALESCE(d.Type, '') || char(31) || d.Definition, char(30)) AS defs
+    FROM _match_uid m
+    JOIN lexicon l ON l.UID = m.uid
+    LEFT JOIN definitions d ON l.UID = d.Lexicon_ID
+    GROUP BY l.UID
+    ORDER BY LENGTH(COALESCE(l.Term, l.Emic_Term))
+"""
+
+_WORD_RELATED_SQL = """
+    SELECT 
+        pl.Term as parent_term,
+        rt.Type,
+        cl.Term as child_term,
+        cl.Translation as child_translation,
+        COUNT(*) OVER () AS total
+    FROM _match_uid m
+    JOIN related_terms rt ON rt.Parent_ID = m.uid
+    JOIN lexicon pl ON rt.Parent_ID = pl.UID
+    JOIN lexicon cl ON rt.Child_ID = cl.UID
+    LIMIT ?
+"""
+
+_LOC_ATTR_SQL = """
+    SELECT 
+        g.Nickname,
+        la.Type,
+        la.Description,
+        la.Date_Start,
+        la.Date_End,
+        COUNT(*) OVER () AS total
+    FROM _match_uid m
+    JOIN location_attributes la ON la.Location_ID = m.uid
+    JOIN gazetteer g ON la.Location_ID = g.UID
+    LIMIT ?
+"""
+
+_LOC_HIER_SQL = """
+    SELECT 
+        gc.Nickname as child_name,
+        lh.Relationship,
+        gp.Nickname as parent_name,
+        COUNT(*) OVER () AS total
+    FROM (
+        SELECT h.Child_ID, h.Parent_ID, h.Relationship
+        FROM _match_uid m
+        JOIN location_hierarchies h ON h.Child_ID = m.uid
+        UNION ALL
+        SELECT h.Child_ID, h.Parent_ID, h.Relationship
+        FROM _match_uid m
+        JOIN location_hierarchies h ON h.Parent_ID = m.uid
+        WHERE h.Child_ID NOT IN (SELECT uid FROM _match_uid)
+    ) lh
+    JOIN gazetteer gc ON lh.Child_ID = gc.UID
+    JOIN gazetteer gp ON lh.Parent_ID = gp.UID
+    LIMIT ?
+"""
 
 def word_search(search_term, filter=None, max_results=None, save_report=False):
     """
@@ -366,9 +873,7 @@ def word_search(search_term, filter=None, max_results=None, save_report=False):
         max_results (int, optional): Maximum number of results to display (default: None = unlimited)
         save_report (bool): If True, saves results as markdown report to Inbox
     """
-    conn = sqlite3.connect(database_path)
-    _register_regex(conn)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
 
     print(f"🔍 Searching for: '{search_term}'" + (f" (showing up to {max_results} results per section)" if max_results else ""))
     if filter:
@@ -376,189 +881,124 @@ def word_search(search_term, filter=None, max_results=None, save_report=False):
     print("=" * 80)
 
     try:
-        # 1. First get count of matching lexicon entries
+        # All queries below read one consistent snapshot in a single transaction
+        cursor.execute("BEGIN")
+        
+        # 1. Get the limited set of matching UIDs (or all if max_results is None);
+        # the window count carries the total number of matches on every row
+        search_columns = ['Term', 'Translation', 'Emic_Term', 'Colonial_Term', 'Transliteration']
+        fts_sql, fts_params = _fts_prefilter(cursor, 'lexicon', 'l.UID', search_term, search_columns)
+        term_sql, term_params = _regexp_clause([f"l.{col}" for col in search_columns], search_term)
+        where_sql = fts_sql + term_sql
+        params = {**fts_params, **term_params}
         if filter:
-            count_query = """
-                SELECT COUNT(DISTINCT l.UID)
-                FROM lexicon l
-                WHERE (l.Term REGEXP ? OR l.Translation REGEXP ? OR l.Emic_Term REGEXP ? 
-                   OR l.Colonial_Term REGEXP ? OR l.Transliteration REGEXP ?)
-                   AND (l.Scope REGEXP ? OR l.Etymology REGEXP ? OR l.Tags REGEXP ?);
-            """
-            cursor.execute(count_query, (search_term, search_term, search_term, search_term, search_term, 
-                                         filter, filter, filter))
-        else:
-            count_query = """
-                SELECT COUNT(DISTINCT l.UID)
+            filter_sql, filter_params = _regexp_clause(['l.Scope', 'l.Etymology', 'l.Tags'], filter, 'flt')
+            where_sql += f"\n                  AND {filter_sql}"
+            params.update(filter_params)
+        
+        # The ORDER BY sits with the LIMIT in the outer query, so the order is
+        # guaranteed: shortest term first, UID breaking ties
+        uid_query = f"""
+            SELECT UID, COUNT(*) OVER () AS total
+            FROM (
+                SELECT l.UID, LENGTH(COALESCE(l.Term, l.Emic_Term)) AS sortlen
                 FROM lexicon l
-                WHERE l.Term REGEXP ? OR l.Translation REGEXP ? OR l.Emic_Term REGEXP ? 
-                   OR l.Colonial_Term REGEXP ? OR l.Transliteration REGEXP ?;
-            """
-            cursor.execute(count_query, (search_term, search_term, search_term, search_term, search_term))
+                WHERE {where_sql}
+            )
+            ORDER BY sortlen, UID
+        """
+        if max_results:
+            uid_query += " LIMIT :lim;"
+            params['lim'] = max_results
+        cursor.execute(uid_query, params)
         
-        lexicon_total = cursor.fetchone()[0]
+        # Stream the UIDs straight off the cursor; every row carries the same total
+        limited_uids = []
+        lexicon_total = 0
+        for uid, lexicon_total in cursor:
+            limited_uids.append(uid)
 
         # 2. Get matching lexicon entries with their definitions
-        # First, get the limited set of UIDs (or all if max_results is None)
-        if filter:
-            uid_query = """
-                SELECT DISTINCT l.UID
-                FROM lexicon l
-                WHERE (l.Term REGEXP ? OR l.Translation REGEXP ? OR l.Emic_Term REGEXP ? 
-                   OR l.Colonial_Term REGEXP ? OR l.Transliteration REGEXP ?)
-                   AND (l.Scope REGEXP ? OR l.Etymology REGEXP ? OR l.Tags REGEXP ?)
-                ORDER BY LENGTH(COALESCE(l.Term, l.Emic_Term))
-            """
-            params = (search_term, search_term, search_term, search_term, search_term, 
-                     filter, filter, filter)
-            if max_results:
-                uid_query += " LIMIT ?;"
-                params = params + (max_results,)
-            cursor.execute(uid_query, params)
-        else:
-            uid_query = """
-                SELECT DISTINCT l.UID
-                FROM lexicon l
-                WHERE l.Term REGEXP ? OR l.Translation REGEXP ? OR l.Emic_Term REGEXP ? 
-                   OR l.Colonial_Term REGEXP ? OR l.Transliteration REGEXP ?
-                ORDER BY LENGTH(COALESCE(l.Term, l.Emic_Term))
-            """
-            params = (search_term, search_term, search_term, search_term, search_term)
-            if max_results:
-                uid_query += " LIMIT ?;"
-                params = params + (max_results,)
-            cursor.execute(uid_query, params)
-        
-        limited_uids = [row[0] for row in cursor.fetchall()]
-        
-        if not limited_uids:
-            lexicon_results = []
-            matched_uids = []
-        else:
-            # Now get all data for these UIDs including all their definitions
-            placeholders = ','.join(['?' for _ in limited_uids])
-            query = f"""
-                SELECT 
-                    l.UID,
-                    l.Term,
-                    l.Translation,
-                    l.Emic_Term,
-                    l.Colonial_Term,
-                    l.Transliteration,
-                    l.Etymology,
-                    l.Scope,
-                    l.Tags,
-                    d.Definition,
-                    d.Type
-                FROM lexicon l
-                LEFT JOIN definitions d ON l.UID = d.Lexicon_ID
-                WHERE l.UID IN ({placeholders})
-                ORDER BY LENGTH(COALESCE(l.Term, l.Emic_Term));
-            """
-            cursor.execute(query, limited_uids)
-            lexicon_results = cursor.fetchall()
-            matched_uids = limited_uids
-
-        print(f"📚 LEXICON ENTRIES (displaying {len(set([r[0] for r in lexicon_results]))} out of {lexicon_total} matches)")
+        matched_uids = limited_uids
+        lexicon_count = len(limited_uids)
+
+        print(f"📚 LEXICON ENTRIES (displaying {lexicon_count} out of {lexicon_total} matches)")
         print("-" * 40)
         
-        if lexicon_results:
-            # Group by UID to handle multiple definitions
-            entry_dict = {}
-            for uid, term, translation, emic, colonial, translit, etymology, scope, tags, definition, def_type in lexicon_results:
-                if uid not in entry_dict:
-                    entry_dict[uid] = {
-                        'term': term,
-                        'translation': translation,
-                        'emic': emic,
-                        'colonial': colonial,
-                        'translit': translit,
-                        'etymology': etymology,
-                        'scope': scope,
-                        'tags': tags,
-                        'definitions': []
-                    }
-                if definition:
-                    entry_dict[uid]['definitions'].append((def_type, definition))
-            
-            for i, (uid, data) in enumerate(entry_dict.items(), 1):
+        if limited_uids:
+            # Now get all data for these UIDs, one row per entry; its definitions
+            # come back as "Type<US>Definition" pairs joined by <RS> (ASCII 31/30).
+            # Rows are read straight off the cursor into the listing
+            _load_match_uids(cursor, limited_uids)
+            cursor.execute(_WORD_DETAIL_SQL)
+            lines = []
+            for i, (uid, term, translation, emic, colonial, translit, etymology, scope, tags, defs) in enumerate(cursor, 1):
                 # Display the main term
-                main_display = data['term'] or data['emic'] or data['translit']
-                print(f"{i}. {main_display}")
+                main_display = term or emic or translit
+                lines.append(f"{i}. {main_display}")
                 
-                if data['translation']:
-                    print(f"   🔤 Translation: {data['translation']}")
-                if data['emic']:
-                    print(f"   🔤 Emic Term: {data['emic']}")
-                if data['colonial']:
-                    print(f"   🔤 Colonial Term: {data['colonial']}")
-                if data['translit']:
-                    print(f"   🔤 Transliteration: {data['translit']}")
-                if data['etymology']:
-                    print(f"   🌱 Etymology: {data['etymology']}")
-                if data['scope']:
-                    print(f"   📍 Scope: {data['scope']}")
-                if data['tags']:
-                    print(f"   🏷️ Tags: {data['tags']}")
+                if translation:
+                    lines.append(f"   🔤 Translation: {translation}")
+                if emic:
+                    lines.append(f"   🔤 Emic Term: {emic}")
+                if colonial:
+                    lines.append(f"   🔤 Colonial Term: {colonial}")
+                if translit:
+                    lines.append(f"   🔤 Transliteration: {translit}")
+                if etymology:
+                    lines.append(f"   🌱 Etymology: {etymology}")
+                if scope:
+                    lines.append(f"   📍 Scope: {scope}")
+                if tags:
+                    lines.append(f"   🏷️ Tags: {tags}")
                 
                 # Display definitions
-                if data['definitions']:
-                    for def_type, definition in data['definitions']:
+                if defs:
+                    for pair in defs.split('\x1e'):
+                        def_type, definition = pair.split('\x1f', 1)
+                        if not definition:
+                            continue
                         if def_type:
-                            print(f"   📖 {def_type}: {definition}")
+                            lines.append(f"   📖 {def_type}: {definition}")
                         else:
-                            print(f"   📖 {definition}")
-                print()
+                            lines.append(f"   📖 {definition}")
+                lines.append("")
+            print("\n".join(lines))
         else:
             print("   No matches found\n")
 
         # 3. Get related terms for matched entries
         if matched_uids:
-            cursor.execute(f"""
-                SELECT COUNT(*)
-                FROM related_terms rt
-                WHERE rt.Parent_ID IN ({','.join(['?' for _ in matched_uids])});
-            """, matched_uids)
-            related_total = cursor.fetchone()[0]
-
-            cursor.execute(f"""
-                SELECT 
-                    pl.Term as parent_term,
-                    rt.Type,
-                    cl.Term as child_term,
-                    cl.Translation as child_translation
-                FROM related_terms rt
-                JOIN lexicon pl ON rt.Parent_ID = pl.UID
-                JOIN lexicon cl ON rt.Child_ID = cl.UID
-                WHERE rt.Parent_ID IN ({','.join(['?' for _ in matched_uids])})
-            """ + (" LIMIT ?" if max_results else ""),
-            matched_uids + ([max_results] if max_results else []))
-
-            related_results = cursor.fetchall()
+            cursor.execute(_WORD_RELATED_SQL, (max_results or -1,))
+            related_rows, related_count, related_total = _window_rows(cursor, max_results)
             
-            print(f"🔗 RELATED TERMS (displaying {len(related_results)} out of {related_total} matches)")
+            print(f"🔗 RELATED TERMS (displaying {related_count} out of {related_total} matches)")
             print("-" * 40)
             
-            if related_results:
-                for i, (parent, rel_type, child, child_trans) in enumerate(related_results, 1):
-                    print(f"{i}. {parent} → {child}")
+            if related_count:
+                lines = []
+                for i, (parent, rel_type, child, child_trans, _) in enumerate(related_rows, 1):
+                    lines.append(f"{i}. {parent} → {child}")
                     if rel_type:
-                        print(f"   📝 Type: {rel_type}")
+                        lines.append(f"   📝 Type: {rel_type}")
                     if child_trans:
-                        print(f"   🔤 Translation: {child_trans}")
-                    print()
+                        lines.append(f"   🔤 Translation: {child_trans}")
+                    lines.append("")
+                print("\n".join(lines))
             else:
                 print("   No related terms found\n")
 
         # Summary
         print("=" * 80)
-        print(f"📊 SUMMARY: {len(set([r[0] for r in lexicon_results]))} lexicon entries, {len(related_results) if matched_uids else 0} related terms")
+        print(f"📊 SUMMARY: {lexicon_count} lexicon entries, {related_count if matched_uids else 0} related terms")
 
     except Exception as e:
         print(f"❌ Search error: {e}")
     finally:
+        if cursor.connection.in_transaction:
+            cursor.execute("COMMIT")
         cursor.close()
-        conn.close()
+        _optimize_once()
 
 
 def location_search(search_term, max_results=None, save_report=False):
@@ -570,140 +1010,115 @@ def location_search(search_term, max_results=None, save_report=False):
         max_results (int, optional): Maximum number of results to display per section (default: None = unlimited)
         save_report (bool): If True, saves results as markdown report to Inbox
     """
-    conn = sqlite3.connect(database_path)
-    _register_regex(conn)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
 
     print(f"🔍 Searching for: '{search_term}'" + (f" (showing up to {max_results} results per section)" if max_results else ""))
     print("=" * 80)
 
     try:
-        # 1. Search gazetteer and get total count
-        cursor.execute("""
-            SELECT COUNT(*)
-            FROM gazetteer
-            WHERE Nickname REGEXP ? OR Location_Name_Arabic REGEXP ? 
-               OR Location_Name_Colonial REGEXP ? OR Location_Name_Latin REGEXP ?;
-        """, (search_term, search_term, search_term, search_term))
-        gazetteer_total = cursor.fetchone()[0]
-
-        cursor.execute("""
-            SELECT UID, Nickname, Location_Name_Arabic, Location_Name_Colonial, Location_Name_Latin
-            FROM gazetteer
-            WHERE Nickname REGEXP ? OR Location_Name_Arabic REGEXP ? 
-               OR Location_Name_Colonial REGEXP ? OR Location_Name_Latin REGEXP ?
-            ORDER BY LENGTH(COALESCE(Nickname, Location_Name_Latin))
-        """ + (" LIMIT ?" if max_results else ""), 
-        (search_term, search_term, search_term, search_term) + ((max_results,) if max_results else ()))
-
-        gazetteer_results = cursor.fetchall()
-        matched_uids = [row[0] for row in gazetteer_results]
-
-        print(f"📍 GAZETTEER ENTRIES (displaying {len(gazetteer_results)} out of {gazetteer_total} matches)")
+        # All queries below read one consistent snapshot in a single transaction
+        cursor.execute("BEGIN")
+        
+        # 1. Search gazetteer; the window count carries the total number of matches
+        search_columns = ['Nickname', 'Location_Name_Arabic', 'Location_Name_Colonial', 'Location_Name_Latin']
+        fts_sql, fts_params = _fts_prefilter(cursor, 'gazetteer', 'UID', search_term, search_columns)
+        term_sql, term_params = _regexp_clause(search_columns, search_term)
+        cursor.execute(f"""
+            SELECT UID, Nickname, Location_Name_Arabic, Location_Name_Colonial, Location_Name_Latin,
+                   COUNT(*) OVER () AS total
+            FROM (
+                SELECT UID, Nickname, Location_Name_Arabic, Location_Name_Colonial, Location_Name_Latin,
+                       LENGTH(COALESCE(Nickname, Location_Name_Latin)) AS sortlen
+                FROM gazetteer
+                WHERE {fts_sql}{term_sql}
+            )
+            ORDER BY sortlen, UID
+        """ + (" LIMIT :lim" if max_results else ""), 
+        {**fts_params, **term_params, 'lim': max_results})
+
+        gazetteer_rows, locations_count, gazetteer_total = _window_rows(cursor, max_results)
+        matched_uids = []
+
+        print(f"📍 GAZETTEER ENTRIES (displaying {locations_count} out of {gazetteer_total} matches)")
         print("-" * 40)
         
-        if gazetteer_results:
-            for i, (uid, nickname, arabic, colonial, latin) in enumerate(gazetteer_results, 1):
-                print(f"{i}. {nickname}")
+        if locations_count:
+            # Collect the listing (and the matched UIDs) straight off the cursor
+            # and write it in one go
+            lines = []
+            for i, (uid, nickname, arabic, colonial, latin, _) in enumerate(gazetteer_rows, 1):
+                matched_uids.append(uid)
+                lines.append(f"{i}. {nickname}")
                 if arabic:
-                    print(f"   🔤 Arabic: {arabic}")
+                    lines.append(f"   🔤 Arabic: {arabic}")
                 if colonial:
-                    print(f"   🔤 Colonial: {colonial}")
+                    lines.append(f"   🔤 Colonial: {colonial}")
                 if latin:
-                    print(f"   🔤 Latin: {latin}")
-                print()
+                    lines.append(f"   🔤 Latin: {latin}")
+                lines.append("")
+            print("\n".join(lines))
         else:
             print("   No matches found\n")
 
         # 2. Get location attributes for matched locations
         if matched_uids:
-            cursor.execute(f"""
-                SELECT COUNT(*)
-                FROM location_attributes
-                WHERE Location_ID IN ({','.join(['?' for _ in matched_uids])});
-            """, matched_uids)
-            attributes_total = cursor.fetchone()[0]
-
-            cursor.execute(f"""
-                SELECT 
-                    g.Nickname,
-                    la.Type,
-                    la.Description,
-                    la.Date_Start,
-                    la.Date_End
-                FROM location_attributes la
-                JOIN gazetteer g ON la.Location_ID = g.UID
-                WHERE la.Location_ID IN ({','.join(['?' for _ in matched_uids])})
-            """ + (" LIMIT ?" if max_results else ""), 
-            matched_uids + ([max_results] if max_results else []))
-
-            attributes_results = cursor.fetchall()
+            _load_match_uids(cursor, matched_uids)
+            cursor.execute(_LOC_ATTR_SQL, (max_results or -1,))
+
+            attributes_rows, attributes_count, attributes_total = _window_rows(cursor, max_results)
             
-            print(f"📋 LOCATION ATTRIBUTES (displaying {len(attributes_results)} out of {attributes_total} matches)")
+            print(f"📋 LOCATION ATTRIBUTES (displaying {attributes_count} out of {attributes_total} matches)")
             print("-" * 40)
             
-            if attributes_results:
-                for i, (nickname, loc_type, description, date_start, date_end) in enumerate(attributes_results, 1):
-                    print(f"{i}. {nickname}")
+            if attributes_count:
+                lines = []
+                for i, (nickname, loc_type, description, date_start, date_end, _) in enumerate(attributes_rows, 1):
+                    lines.append(f"{i}. {nickname}")
                     if loc_type:
-                        print(f"   📝 Type: {loc_type}")
+                        lines.append(f"   📝 Type: {loc_type}")
                     if description:
-                        print(f"   📖 {description}")
+                        lines.append(f"   📖 {description}")
                     if date_start or date_end:
                         date_range = f"{date_start or '?'} - {date_end or '?'}"
-                        print(f"   📅 Period: {date_range}")
-                    print()
+                        lines.append(f"   📅 Period: {date_range}")
+                    lines.append("")
+                print("\n".join(lines))
             else:
                 print("   No attributes found\n")
 
-            # 3. Get location hierarchies
-            cursor.execute(f"""
-                SELECT COUNT(*)
-                FROM location_hierarchies
-                WHERE Child_ID IN ({','.join(['?' for _ in matched_uids])})
-                   OR Parent_ID IN ({','.join(['?' for _ in matched_uids])});
-            """, matched_uids + matched_uids)
-            hierarchies_total = cursor.fetchone()[0]
-
-            cursor.execute(f"""
-                SELECT 
-                    gc.Nickname as child_name,
-                    lh.Relationship,
-                    gp.Nickname as parent_name
-                FROM location_hierarchies lh
-                JOIN gazetteer gc ON lh.Child_ID = gc.UID
-                JOIN gazetteer gp ON lh.Parent_ID = gp.UID
-                WHERE lh.Child_ID IN ({','.join(['?' for _ in matched_uids])})
-                   OR lh.Parent_ID IN ({','.join(['?' for _ in matched_uids])})
-            """ + (" LIMIT ?" if max_results else ""),
-            matched_uids + matched_uids + ([max_results] if max_results else []))
-
-            hierarchies_results = cursor.fetchall()
+            # 3. Get location hierarchies: links up from the matched locations,
+            # then links down to them, each branch read through its own index
+            cursor.execute(_LOC_HIER_SQL, (max_results or -1,))
+
+            hierarchies_rows, hierarchies_count, hierarchies_total = _window_rows(cursor, max_results)
             
-            print(f"🏛️ LOCATION HIERARCHIES (displaying {len(hierarchies_results)} out of {hierarchies_total} matches)")
+            print(f"🏛️ LOCATION HIERARCHIES (displaying {hierarchies_count} out of {hierarchies_total} matches)")
             print("-" * 40)
             
-            if hierarchies_results:
-                for i, (child, relationship, parent) in enumerate(hierarchies_results, 1):
-                    print(f"{i}. {child} → {parent}")
+            if hierarchies_count:
+                lines = []
+                for i, (child, relationship, parent, _) in enumerate(hierarchies_rows, 1):
+                    lines.append(f"{i}. {child} → {parent}")
                     if relationship:
-                        print(f"   📝 Relationship: {relationship}")
-                    print()
+                        lines.append(f"   📝 Relationship: {relationship}")
+                    lines.append("")
+                print("\n".join(lines))
             else:
                 print("   No hierarchies found\n")
 
         # Summary
         print("=" * 80)
-        locations_count = len(gazetteer_results)
-        attributes_count = len(attributes_results) if matched_uids else 0
-        hierarchies_count = len(hierarchies_results) if matched_uids else 0
+        if not matched_uids:
+            attributes_count = hierarchies_count = 0
         print(f"📊 SUMMARY: {locations_count} locations, {attributes_count} attributes, {hierarchies_count} hierarchies")
 
     except Exception as e:
         print(f"❌ Search error: {e}")
     finally:
+        if cursor.connection.in_transaction:
+            cursor.execute("COMMIT")
         cursor.close()
-        conn.close()
+        _optimize_once()
 
 
 def _auto_detect_search_config(cursor, table_name):
@@ -718,8 +1133,7 @@ def _auto_detect_search_config(cursor, table_name):
     Returns:
         dict: Configuration dictionary with search_fields, display_fields, foreign_keys, emoji
     """
-    cursor.execute(f"PRAGMA table_info({table_name});")
-    columns = cursor.fetchall()
+    columns = _table_info(table_name)
     
     search_fields = []
     display_fields = ['UID']  # Always include UID first
@@ -779,7 +1193,187 @@ def _get_notes_fields(search_fields):
     return [f for f in search_fields if any(keyword in f for keyword in notes_keywords)]
 
 
-def _display_related_records(cursor, table, uid, related_tables_config):
+def _search_plan(table, include_notes):
+    """
+    Return the SQL and field lists gen_search uses for a table.
+    
+    Built once per table, notes setting, and schema version from
+    TABLE_SEARCH_CONFIG (or the auto-detected config), keeping only fields
+    that exist in the table.
+    
+    Returns:
+        dict: config, notes_fields, display_fields, page_sql (one page of
+              matching rows), notes_page_sql (see below) and fk_lookups, or None if none of
+              the search fields exist
+    
+    Each SQL entry is a {literal: SQL} pair: REGEXP conditions for regex
+    terms, instr() for plain substrings (see _plan_query). The SQL uses named
+    parameters: :term (bound once however many columns are searched),
+    :match for the full-text prefilter and :lim for the page size.
+    
+    When include_notes is False, notes_page_sql finds the rows that match
+    only in the Notes fields, so a search can be widened to them without
+    rescanning the main fields (None if the table has no Notes fields).
+    """
+    schema_version = _get_conn().execute("PRAGMA schema_version").fetchone()[0]
+    return _search_plan_at(schema_version, table, include_notes)
+
+
+@lru_cache(maxsize=64)
+def _search_plan_at(schema_version, table, include_notes):
+    config = TABLE_SEARCH_CONFIG.get(table)
+    if config is None:
+        config = _auto_detect_search_config(_get_conn().cursor(), table)
+    
+    # Determine which fields to search
+    search_fields = config['search_fields']
+    notes_fields = _get_notes_fields(search_fields)
+    if not include_notes:
+        search_fields = [f for f in search_fields if f not in notes_fields]
+    
+    # Validate that search fields exist in the table
+    table_columns = {col[1] for col in _table_info(table)}
+    valid_search_fields = [f for f in search_fields if f in table_columns]
+    if not valid_search_fields:
+        return None
+    
+    # Validate display fields and filter to only existing ones
+    valid_display_fields = [f for f in config['display_fields'] if f in table_columns]
+    if not valid_display_fields:
+        valid_display_fields = ['UID']  # Fallback to just UID
+    
+    # Escape column names with backticks (for SQL reserved words)
+    def conditions(fields, literal):
+        if literal:
+            return ' OR '.join([f"instr(`{field}`, :term) > 0" for field in fields])
+        return _regexp_any_sql([f"`{field}`" for field in fields], ':term')
+    
+    # Fields after UID and the main one are shown truncated to 100 characters;
+    # cut long text in SQL so the full value never leaves SQLite
+    display_cols = ', '.join(
+        [f"`{f}`" for f in valid_display_fields[:2]] +
+        [f"CASE WHEN typeof(`{f}`) = 'text' AND length(`{f}`) > 100 "
+         f"THEN substr(`{f}`, 1, 100) || '...' ELSE `{f}` END" for f in valid_display_fields[2:]]
+    )
+    
+    plan = {
+        'config': config,
+        'notes_fields': notes_fields,
+        'display_fields': valid_display_fields,
+        'page_sql': {
+            literal: f"SELECT {display_cols} FROM {table} "
+                     f"WHERE {conditions(valid_search_fields, literal)} LIMIT :lim;"
+            for literal in (False, True)
+        },
+        'fts_page_sql': None,
+        'notes_page_sql': None,
+        # (field, SQL, label) for each foreign key resolved in the display loop;
+        # the SQL looks up every UID loaded into _match_uid at once
+        'fk_lookups': [
+            (fk_field,
+             f"SELECT t.UID, t.{fk_config['display_field']} FROM _match_uid m JOIN {fk_config['table']} t ON t.UID = m.uid;",
+             fk_config['label'])
+            for fk_field, fk_config in config['foreign_keys'].items()
+        ],
+    }
+    
+    # Variants that first narrow rows through the table's full-text index
+    if _fts_covers(table, valid_search_fields):
+        fts_table = f"{table}_fts"
+        plan['fts_page_sql'] = {
+            literal: f"SELECT {display_cols} FROM {table} "
+                     f"WHERE UID IN (SELECT rowid FROM {fts_table} WHERE {fts_table} MATCH :match) "
+                     f"AND ({conditions(valid_search_fields, literal)}) LIMIT :lim;"
+            for literal in (False, True)
+        }
+    
+    # Rows matching in the Notes fields but not in the main ones (COALESCE
+    # because instr() on a NULL column is NULL, which NOT would keep NULL)
+    valid_notes_fields = [f for f in notes_fields if f in table_columns]
+    if not include_notes and valid_notes_fields:
+        plan['notes_page_sql'] = {
+            literal: f"SELECT {display_cols} FROM {table} "
+                     f"WHERE ({conditions(valid_notes_fields, literal)}) "
+                     f"AND NOT COALESCE(({conditions(valid_search_fields, literal)}), 0) LIMIT :lim;"
+            for literal in (False, True)
+        }
+    
+    return plan
+
+
+def _plan_query(plan, key, search_term):
+    """
+    Pick a search plan's SQL (e.g. 'page_sql') for a search term.
+    
+    A term with no regex syntax is a plain substring test and uses the
+    instr() variant, so no row calls back into Python. Terms with a literal
+    (or required literal run) of 3+ characters also use the full-text
+    prefiltered variant when the table has one.
+    
+    Returns:
+        tuple: (SQL, named params dict; the caller adds 'lim')
+    """
+    literal = bool(search_term) and not _REGEX_META_RE.search(search_term)
+    match_term = _fts_match_term(search_term)
+    if match_term and plan.get('fts_' + key):
+        return plan['fts_' + key][literal], {'term': search_term, 'match': match_term}
+    return plan[key][literal], {'term': search_term}
+
+
+def _get_ro_conn():
+    """
+    Return this thread's read-only connection, used by searches that scan
+    several tables in parallel (the shared connection is bound to one thread).
+    
+    The threads belong to the long-lived _get_pool() executor, so each
+    connection, and the prepared statements in its cache, is kept from one
+    gen_search call to the next.
+    """
+    conn = getattr(_ro_local, 'conn', None)
+    if conn is None:
+        # check_same_thread=False only so _close_ro_conns can close it at exit;
+        # the connection is otherwise only ever used by this thread
+        conn = sqlite3.connect(f"file:{quote(database_path)}?mode=ro", uri=True,
+                               cached_statements=256, check_same_thread=False)
+        # query_only guards against accidental writes; the shared connection
+        # can't take it because it builds indexes and the _match_uid TEMP table
+        conn.execute("PRAGMA query_only=1")
+        conn.execute("PRAGMA temp_store=MEMORY")
+        conn.execute("PRAGMA cache_size=-64000")
+        conn.execute("PRAGMA mmap_size=30000000000")
+        _register_regex(conn)
+        _ro_local.conn = conn
+        with _ro_lock:
+            _ro_conns.append(conn)
+    return conn
+
+
+def _get_pool():
+    """Return the worker pool for parallel scans, created on first use."""
+    global _pool
+    if _pool is None:
+        _pool = ThreadPoolExecutor(max_workers=8, thread_name_prefix='db_scan')
+        atexit.register(_close_ro_conns)
+    return _pool
+
+
+def _fetch_rows(query, params):
+    """Run a query on this thread's read-only connection and return all rows"""
+    return _get_ro_conn().execute(query, params).fetchall()
+
+
+def _fetch_pages(cursor, queries):
+    """
+    Run a list of (SQL, params) queries and return their rows in order.
+    Several queries are run concurrently on the shared worker pool, each
+    worker reusing its own read-only connection.
+    """
+    if len(queries) > 1:
+        return list(_get_pool().map(lambda query: _fetch_rows(*query), queries))
+    return [cursor.execute(*query).fetchall() for query in queries]
+
+
+def _display_related_records(cursor, table, uid, related_tables_config, rows=None):
     """
     Display related records from junction tables.
     
@@ -795,6 +1389,8 @@ def _display_related_records(cursor, table, uid, related_tables_config):
                 - target_table: Name of the related target table
                 - target_display: Field to display from target table
                 - label: Human-readable label for the relationship
+        rows: (config index, name) rows already fetched by
+            _fetch_related_records (optional; queried here when None)
     
     Example:
         Related to a person through relationships table:
@@ -807,42 +1403,103 @@ def _display_related_records(cursor, table, uid, related_tables_config):
             'label': 'Children'
         }
     """
-    for rel_config in related_tables_config:
-        junction_table = rel_config['junction_table']
-        junction_fk = rel_config['junction_fk']
-        target_fk = rel_config['target_fk']
-        target_table = rel_config['target_table']
+    if rows is not None:
+        _print_related_records(rows, related_tables_config)
+        return
+    
+    # One UNION ALL query covers every relationship; each branch is tagged with
+    # its position in the config and keeps its own LIMIT via a subquery, taking
+    # the first 10 names by target UID as _fetch_related_records does.
+    # Empty names are dropped in SQL so they never use up the LIMIT.
+    branches = []
+    for i, rel_config in enumerate(related_tables_config):
         target_display = rel_config['target_display']
-        label = rel_config['label']
-        
-        # Build query to find related records through junction table
-        query = f"""
-            SELECT t.{target_display}
-            FROM {junction_table} j
-            JOIN {target_table} t ON j.{target_fk} = t.UID
-            WHERE j.{junction_fk} = ?
-            LIMIT 10;
-        """
-        
+        branches.append(f"""
+            SELECT * FROM (
+                SELECT {i} AS rel_index, t.{target_display} AS name, t.UID AS target_uid
+                FROM {rel_config['junction_table']} j
+                JOIN {rel_config['target_table']} t ON j.{rel_config['target_fk']} = t.UID
+                WHERE j.{rel_config['junction_fk']} = ?
+                  AND t.{target_display} IS NOT NULL AND t.{target_display} != ''
+                ORDER BY t.UID
+                LIMIT 10
+            )
+        """)
+    
+    try:
+        cursor.execute(f"SELECT rel_index, name FROM ({' UNION ALL '.join(branches)}) "
+                       f"ORDER BY rel_index, target_uid", (uid,) * len(branches))
+        rows = cursor.fetchall()
+    except Exception:
+        # A bad relationship config fails the whole query; fall back to one
+        # query per relationship so the others still display
+        rows = []
+        for i, branch in enumerate(branches):
+            try:
+                cursor.execute(f"SELECT rel_index, name FROM ({branch}) ORDER BY target_uid", (uid,))
+                rows.extend(cursor.fetchall())
+            except Exception:
+                # Silently skip if there's an error with this relationship
+                pass
+    
+    _print_related_records(rows, related_tables_config)
+
+
+def _print_related_records(rows, related_tables_config):
+    """Print (config index, name) rows grouped by relationship label"""
+    for rel_index, related in groupby(rows, key=itemgetter(0)):
+        label = related_tables_config[rel_index]['label']
+        related_names = [r[1] for r in related]
         try:
-            cursor.execute(query, (uid,))
-            related = cursor.fetchall()
-            
-            if related:
-                related_names = [r[0] for r in related if r[0]]  # Filter out None values
-                if related_names:
-                    # Truncate if too many
-                    if len(related_names) > 5:
-                        display = ', '.join(related_names[:5]) + f' (+{len(related_names) - 5} more)'
-                    else:
-                        display = ', '.join(related_names)
-                    print(f"   🔗 {label}: {display}")
-        except Exception as e:
-            # Silently skip if there's an error with this relationship
+            # Truncate if too many
+            if len(related_names) > 5:
+                display = ', '.join(related_names[:5]) + f' (+{len(related_names) - 5} more)'
+            else:
+                display = ', '.join(related_names)
+            print(f"   🔗 {label}: {display}")
+        except Exception:
             pass
 
 
-def _display_definitions(cursor, uid, definitions_table, fk_column):
+def _fetch_related_records(cursor, uids, related_tables_config):
+    """
+    Fetch related records for a page of records in one query, keeping
+    _display_related_records' limit of 10 names per record and relationship.
+    
+    Returns:
+        dict: {uid: [(config index, name), ...]} (records without related
+        names map to an empty list), or None if the query fails
+    """
+    branches = []
+    for i, rel_config in enumerate(related_tables_config):
+        target_display = rel_config['target_display']
+        junction_fk = rel_config['junction_fk']
+        branches.append(f"""
+            SELECT j.{junction_fk} AS uid, {i} AS rel_index, t.{target_display} AS name,
+                   ROW_NUMBER() OVER (PARTITION BY j.{junction_fk} ORDER BY t.UID) AS rn
+            FROM {rel_config['junction_table']} j
+            JOIN {rel_config['target_table']} t ON j.{rel_config['target_fk']} = t.UID
+            WHERE j.{junction_fk} IN (SELECT uid FROM _match_uid)
+              AND t.{target_display} IS NOT NULL AND t.{target_display} != ''
+        """)
+    query = f"""
+        SELECT uid, rel_index, name
+        FROM ({" UNION ALL ".join(branches)})
+        WHERE rn <= 10
+        ORDER BY uid, rel_index, rn
+    """
+    
+    try:
+        _load_match_uids(cursor, uids)
+        grouped = {uid: [] for uid in uids}
+        for uid, group in groupby(cursor.execute(query), itemgetter(0)):
+            grouped[uid] = [row[1:] for row in group]
+        return grouped
+    except sqlite3.Error:
+        return None
+
+
+def _display_definitions(cursor, uid, definitions_table, fk_column, definitions=None):
     """
     Display definitions for lexicon or social_roles entries.
     
@@ -854,6 +1511,8 @@ def _display_definitions(cursor, uid, definitions_table, fk_column):
         uid: UID of the lexicon or social_roles entry
         definitions_table: Name of the definitions table (usually 'definitions')
         fk_column: Foreign key column name ('Lexicon_ID' or 'Social_Role_ID')
+        definitions: Rows already fetched by _fetch_definitions (optional;
+            queried here when None)
     
     Example SQL generated:
         SELECT Definition, Type 
@@ -864,12 +1523,14 @@ def _display_definitions(cursor, uid, definitions_table, fk_column):
         SELECT `Definition`, `Type`
         FROM `{definitions_table}`
         WHERE `{fk_column}` = ?
+        ORDER BY `UID`
         LIMIT 5;
     """
     
     try:
-        cursor.execute(query, (uid,))
-        definitions = cursor.fetchall()
+        if definitions is None:
+            cursor.execute(query, (uid,))
+            definitions = cursor.fetchall()
         
         if definitions:
             print(f"   📖 Definitions:")
@@ -887,7 +1548,7 @@ def _display_definitions(cursor, uid, definitions_table, fk_column):
         pass
 
 
-def _display_location_attributes(cursor, location_uid):
+def _display_location_attributes(cursor, location_uid, attributes=None):
     """
     Display location attributes as Type: Value pairs.
     
@@ -899,6 +1560,8 @@ def _display_location_attributes(cursor, location_uid):
     Args:
         cursor: Database cursor
         location_uid: UID of the location in gazetteer table
+        attributes: Rows already fetched by _fetch_location_attributes
+            (optional; queried here when None)
     
     Example SQL generated:
         SELECT Type, Value, Start_Date_Greg, End_Date_Greg
@@ -909,13 +1572,14 @@ def _display_location_attributes(cursor, location_uid):
         SELECT `Type`, `Value`, `Start_Date_Greg`, `End_Date_Greg`
         FROM `location_attributes`
         WHERE `Location_ID` = ?
-        ORDER BY `Type`
+        ORDER BY `Type`, `UID`
         LIMIT 10;
     """
     
     try:
-        cursor.execute(query, (location_uid,))
-        attributes = cursor.fetchall()
+        if attributes is None:
+            cursor.execute(query, (location_uid,))
+            attributes = cursor.fetchall()
         
         if attributes:
             print(f"   🏛️ Attributes:")
@@ -933,6 +1597,69 @@ def _display_location_attributes(cursor, location_uid):
         pass
 
 
+def _fetch_definitions(cursor, uids, definitions_table, fk_column):
+    """
+    Fetch up to 5 definitions (the first by UID) for each of a page of
+    records in one query. Rows come back ordered by record, so they can be
+    grouped with groupby.
+    
+    Returns:
+        dict: {uid: [(Definition, Type), ...]} (records without definitions
+        map to an empty list), or None if the query fails
+    """
+    query = f"""
+        SELECT `{fk_column}`, `Definition`, `Type`
+        FROM (
+            SELECT `{fk_column}`, `Definition`, `Type`,
+                   ROW_NUMBER() OVER (PARTITION BY `{fk_column}` ORDER BY `UID`) AS rn
+            FROM `{definitions_table}`
+            WHERE `{fk_column}` IN (SELECT uid FROM _match_uid)
+        )
+        WHERE rn <= 5
+        ORDER BY `{fk_column}`, rn;
+    """
+    
+    try:
+        _load_match_uids(cursor, uids)
+        grouped = {uid: [] for uid in uids}
+        for fk, group in groupby(cursor.execute(query), itemgetter(0)):
+            grouped[fk] = [row[1:] for row in group]
+        return grouped
+    except sqlite3.Error:
+        return None
+
+
+def _fetch_location_attributes(cursor, location_uids):
+    """
+    Fetch up to 10 attributes (ordered by Type) for each of a page of
+    locations in one query.
+    
+    Returns:
+        dict: {uid: [(Type, Value, Start_Date_Greg, End_Date_Greg), ...]},
+        or None if the query fails
+    """
+    query = """
+        SELECT `Location_ID`, `Type`, `Value`, `Start_Date_Greg`, `End_Date_Greg`
+        FROM (
+            SELECT `Location_ID`, `Type`, `Value`, `Start_Date_Greg`, `End_Date_Greg`,
+                   ROW_NUMBER() OVER (PARTITION BY `Location_ID` ORDER BY `Type`, `UID`) AS rn
+            FROM `location_attributes`
+            WHERE `Location_ID` IN (SELECT uid FROM _match_uid)
+        )
+        WHERE rn <= 10
+        ORDER BY `Location_ID`, rn;
+    """
+    
+    try:
+        _load_match_uids(cursor, location_uids)
+        grouped = {uid: [] for uid in location_uids}
+        for fk, group in groupby(cursor.execute(query), itemgetter(0)):
+            grouped[fk] = [row[1:] for row in group]
+        return grouped
+    except sqlite3.Error:
+        return None
+
+
 def _biblio_serials(search_term, repository_filter=None, max_results=None):
     """
     Internal function: Search bibliography and return list of matching UIDs.
@@ -943,66 +1670,73 @@ def _biblio_serials(search_term, repository_filter=None, max_results=None):
         max_results (int, optional): Maximum number of UIDs to return
     
     Returns:
-        list: List of matching UIDs (integers)
+        array.array: Matching UIDs as 64-bit integers (empty on error)
     
     Example:
-        uids = _biblio_serials('Bukhara')  # Returns [1, 5, 23, ...]
+        uids = _biblio_serials('Bukhara')  # Returns array('q', [1, 5, 23, ...])
     """
-    conn = sqlite3.connect(database_path)
-    _register_regex(conn)
-    cursor = conn.cursor()
-
     # Convert single strings to tuples for uniform handling
     search_terms = (search_term,) if isinstance(search_term, str) else search_term
     repo_filters = (repository_filter,) if isinstance(repository_filter, str) else repository_filter if repository_filter else None
 
+    return _biblio_serials_norm(search_terms, repo_filters, max_results)
+
+
+def _biblio_serials_norm(search_terms, repo_filters, max_results):
+    """
+    _biblio_serials for callers that have already normalized their input:
+    search_terms is a tuple of patterns and repo_filters a tuple or None.
+    """
+    cursor = _get_conn().cursor()
+
     try:
         # Build search_term WHERE clause - OR logic across all patterns and columns
         search_conditions = []
-        search_params = []
-        for term in search_terms:
-            search_conditions.append("(b.Author REGEXP ? OR b.Title REGEXP ? OR b.Gloss REGEXP ?)")
-            search_params.extend([term, term, term])
+        params = {}
+        for i, term in enumerate(search_terms):
+            # Terms with a usable literal are narrowed through the full-text index when there is one
+            fts_sql, fts_params = _fts_prefilter(cursor, 'bibliography', 'b.UID', term, ['Author', 'Title', 'Gloss'], f'match{i}')
+            term_sql, term_params = _regexp_clause(['b.Author', 'b.Title', 'b.Gloss'], term, f'term{i}')
+            search_conditions.append(f"({fts_sql}{term_sql})")
+            params.update(fts_params, **term_params)
         
         search_where = " OR ".join(search_conditions)
         
         # Build repository_filter WHERE clause - AND logic across all patterns
         repo_where = ""
-        repo_params = []
         if repo_filters:
             repo_conditions = []
-            for filter_term in repo_filters:
-                repo_conditions.append(
-                    "(r.Acronym REGEXP ? OR r.Name_Foreign REGEXP ? OR r.Name_English REGEXP ? "
-                    "OR b.Language REGEXP ? OR b.Status REGEXP ? OR b.Tags REGEXP ?)"
-                )
-                repo_params.extend([filter_term] * 6)
+            for i, filter_term in enumerate(repo_filters):
+                filter_sql, filter_params = _regexp_clause(
+                    ['r.Acronym', 'r.Name_Foreign', 'r.Name_English', 'b.Language', 'b.Status', 'b.Tags'],
+                    filter_term, f'flt{i}')
+                repo_conditions.append(filter_sql)
+                params.update(filter_params)
             repo_where = " AND " + " AND ".join(repo_conditions)
         
-        # Query to get just UIDs
+        # Query to get just UIDs; repositories is only needed for the filter
+        repo_join = "LEFT JOIN repositories r ON b.Repository_ID = r.UID" if repo_filters else ""
         query = f"""
             SELECT b.UID
             FROM bibliography b
-            LEFT JOIN repositories r ON b.Repository_ID = r.UID
+            {repo_join}
             WHERE ({search_where}){repo_where}
         """
         
-        params = search_params + repo_params
-        
-        # Get UIDs with optional limit
-        cursor.execute(query + (" LIMIT ?" if max_results else ""), 
-                      params + ([max_results] if max_results else []))
+        # Get UIDs; LIMIT -1 means no limit, so the statement shape is fixed
+        params['lim'] = max_results or -1
+        cursor.execute(query + " LIMIT :lim", params)
         
-        # Extract UIDs from results and return as list
-        uids = [row[0] for row in cursor.fetchall()]
+        # Pack UIDs straight off the cursor into a compact int64 array
+        uids = array.array('q')
+        uids.extend(row[0] for row in cursor)
         return uids
 
     except Exception as e:
         print(f"❌ Search error: {e}")
-        return []
+        return array.array('q')
     finally:
         cursor.close()
-        conn.close()
 
 
 def bib_search(search_term, repository_filter=None, max_results=None, save_report=False):
@@ -1041,7 +1775,7 @@ def bib_search(search_term, repository_filter=None, max_results=None, save_repor
     print("=" * 80)
 
     # Get matching UIDs using the internal function
-    matched_uids = _biblio_serials(search_term, repository_filter, max_results)
+    matched_uids = _biblio_serials_norm(search_terms, repo_filters, max_results)
     
     if not matched_uids:
         print("📚 BIBLIOGRAPHY ENTRIES (displaying 0 matches)")
@@ -1051,72 +1785,65 @@ def bib_search(search_term, repository_filter=None, max_results=None, save_repor
         print(f"📊 SUMMARY: 0 bibliography entries, 0 related sources")
         return
 
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
 
     try:
-        # Get full details for these UIDs
-        placeholders = ','.join(['?' for _ in matched_uids])
-        
-        # Get total count (for display purposes)
-        cursor.execute(f"""
-            SELECT COUNT(*)
-            FROM bibliography b
-            WHERE b.UID IN ({placeholders})
-        """, matched_uids)
-        bibliography_total = cursor.fetchone()[0]
+        # Store the UIDs once; both queries below join against them
+        _load_match_uids(cursor, matched_uids)
 
         # Get full bibliography details
-        cursor.execute(f"""
+        cursor.execute("""
             SELECT b.UID, b.Author, b.Title, b.Gloss, b.Date_Pub_Greg, b.Date_Pub_Hij, 
                    r.Acronym, r.Name_English, b.Catalog_No, b.Language, b.Status, b.Tags
-            FROM bibliography b
+            FROM _match_uid m
+            JOIN bibliography b ON b.UID = m.uid
             LEFT JOIN repositories r ON b.Repository_ID = r.UID
-            WHERE b.UID IN ({placeholders})
-        """, matched_uids)
+        """)
         
-        bibliography_results = cursor.fetchall()
+        # Every matched UID is shown (_biblio_serials already applied
+        # max_results), so the header count needs no extra query; rows are
+        # printed as they come off the cursor
+        bibliography_total = len(matched_uids)
 
-        print(f"📚 BIBLIOGRAPHY ENTRIES (displaying {len(bibliography_results)} out of {bibliography_total} matches)")
+        print(f"📚 BIBLIOGRAPHY ENTRIES (displaying {bibliography_total} out of {bibliography_total} matches)")
         print("-" * 40)
         
+        # Collect the listing and write it in one go
+        lines = []
+        entries_count = 0
         for i, (uid, author, title, gloss, date_greg, date_hij, acronym, repo_name, 
-               catalog, language, status, tags) in enumerate(bibliography_results, 1):
-            print(f"{i}. {author} - {title}")
+               catalog, language, status, tags) in enumerate(cursor, 1):
+            entries_count = i
+            lines.append(f"{i}. {author} - {title}")
             if gloss:
-                print(f"   📝 Gloss: {gloss}")
+                lines.append(f"   📝 Gloss: {gloss}")
             if uid:
-                print(f"   🔑 UID: {uid}")
+                lines.append(f"   🔑 UID: {uid}")
             if acronym:
-                print(f"   🏛️ Repository: {acronym}" + (f" ({repo_name})" if repo_name else ""))
+                lines.append(f"   🏛️ Repository: {acronym}" + (f" ({repo_name})" if repo_name else ""))
             if catalog:
-                print(f"   📋 Catalog: {catalog}")
+                lines.append(f"   📋 Catalog: {catalog}")
             if date_greg:
-                print(f"   📅 Date (Gregorian): {date_greg}")
+                lines.append(f"   📅 Date (Gregorian): {date_greg}")
             if date_hij:
-                print(f"   📅 Date (Hijri): {date_hij}")
+                lines.append(f"   📅 Date (Hijri): {date_hij}")
             # Show filter columns when repository filtering is active
             if repo_filters:
                 if language:
-                    print(f"   🌐 Language: {language}")
+                    lines.append(f"   🌐 Language: {language}")
                 if status:
-                    print(f"   📊 Status: {status}")
+                    lines.append(f"   📊 Status: {status}")
                 if tags:
                     # Clean up tags: split on whitespace, remove empty strings, join with commas
                     clean_tags = ', '.join(filter(None, tags.split()))
-                    print(f"   🏷️  Tags: {clean_tags}")
-            print()
+                    lines.append(f"   🏷️  Tags: {clean_tags}")
+            lines.append("")
 
-        # Get related sources
-        cursor.execute(f"""
-            SELECT COUNT(*)
-            FROM related_sources
-            WHERE Referencing_Source_ID IN ({placeholders})
-               OR Referenced_Source_ID IN ({placeholders});
-        """, matched_uids + matched_uids)
-        related_total = cursor.fetchone()[0]
+        if lines:
+            print("\n".join(lines))
 
-        cursor.execute(f"""
+        # Get related sources
+        cursor.execute("""
             SELECT 
                 b1.Author as ref_author,
                 b1.Title as ref_title,
@@ -1126,37 +1853,42 @@ def bib_search(search_term, repository_filter=None, max_results=None, save_repor
             FROM related_sources rs
             JOIN bibliography b1 ON rs.Referencing_Source_ID = b1.UID
             JOIN bibliography b2 ON rs.Referenced_Source_ID = b2.UID
-            WHERE rs.Referencing_Source_ID IN ({placeholders})
-               OR rs.Referenced_Source_ID IN ({placeholders})
-        """ + (" LIMIT ?" if max_results else ""),
-        matched_uids + matched_uids + ([max_results] if max_results else []))
+            WHERE rs.Referencing_Source_ID IN (SELECT uid FROM _match_uid)
+               OR rs.Referenced_Source_ID IN (SELECT uid FROM _match_uid)
+            LIMIT ?
+        """, (max_results + 1 if max_results else -1,))
 
+        # One row past max_results tells us whether there are more matches,
+        # without counting them all; the header then shows e.g. "20+"
         related_sources = cursor.fetchall()
+        more_related = bool(max_results) and len(related_sources) > max_results
+        if more_related:
+            related_sources = related_sources[:max_results]
+        related_count = len(related_sources)
         
-        print(f"🔗 RELATED SOURCES (displaying {len(related_sources)} out of {related_total} matches)")
+        print(f"🔗 RELATED SOURCES (displaying {related_count} out of {related_count}{'+' if more_related else ''} matches)")
         print("-" * 40)
         
         if related_sources:
+            lines = []
             for i, (ref_auth, ref_title, rel_type, refd_auth, refd_title) in enumerate(related_sources, 1):
-                print(f"{i}. {ref_auth}: {ref_title}")
-                print(f"   → {refd_auth}: {refd_title}")
+                lines.append(f"{i}. {ref_auth}: {ref_title}")
+                lines.append(f"   → {refd_auth}: {refd_title}")
                 if rel_type:
-                    print(f"   📝 Type: {rel_type}")
-                print()
+                    lines.append(f"   📝 Type: {rel_type}")
+                lines.append("")
+            print("\n".join(lines))
         else:
             print("   No related sources found\n")
 
         # Summary
         print("=" * 80)
-        entries_count = len(bibliography_results)
-        related_count = len(related_sources)
         print(f"📊 SUMMARY: {entries_count} bibliography entries, {related_count} related sources")
 
     except Exception as e:
         print(f"❌ Display error: {e}")
     finally:
         cursor.close()
-        conn.close()
 
 
 """
@@ -1496,14 +2228,11 @@ def gen_search(search_term, table_name=None, max_results=20, include_notes=None)
         gen_search('محمد', ('lexicon', 'prosopography'))  # Search multiple tables
         gen_search('rare_term', 'lexicon', include_notes=True)  # Force include Notes
     """
-    conn = sqlite3.connect(database_path)
-    _register_regex(conn)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
     
     try:
         # Get all available tables
-        cursor.execute("SELECT name FROM sqlite_master WHERE type='table' ORDER BY name;")
-        all_tables = [row[0] for row in cursor.fetchall()]
+        all_tables = list(_table_names())
         
         # Handle table selection
         if table_name is None:
@@ -1540,53 +2269,53 @@ def gen_search(search_term, table_name=None, max_results=20, include_notes=None)
         total_results = 0
         tables_with_results = {}
         
+        plans = {}
         for table in table_name:
             if table not in all_tables:
                 print(f"❌ Table '{table}' not found")
                 continue
             
-            # Get search configuration
-            config = TABLE_SEARCH_CONFIG.get(table)
-            if config is None:
-                config = _auto_detect_search_config(cursor, table)
+            if table not in TABLE_SEARCH_CONFIG:
                 print(f"⚠️  Using auto-detected configuration for '{table}'")
             
-            # Determine which fields to search
-            search_fields = config['search_fields'].copy()
-            notes_fields = _get_notes_fields(search_fields)
-            
             # If include_notes is explicitly False or None (first pass), exclude Notes fields
-            if include_notes is False or include_notes is None:
-                search_fields = [f for f in search_fields if f not in notes_fields]
-            
-            if not search_fields:
-                continue
-            
-            # Validate that search fields exist in the table
-            cursor.execute(f"PRAGMA table_info({table});")
-            table_columns = [col[1] for col in cursor.fetchall()]
-            valid_search_fields = [f for f in search_fields if f in table_columns]
-            
-            if not valid_search_fields:
+            plan = _search_plan(table, bool(include_notes))
+            if plan is None:
                 # Skip this table if none of the search fields exist
                 continue
-            
-            # Build search query with escaped column names (backticks for SQL reserved words)
-            search_conditions = ' OR '.join([f"`{field}` REGEXP ?" for field in valid_search_fields])
-            search_params = [search_term] * len(valid_search_fields)
-            
-            # Get total count
-            count_query = f"SELECT COUNT(*) FROM {table} WHERE {search_conditions};"
-            cursor.execute(count_query, search_params)
-            table_total = cursor.fetchone()[0]
-            
-            if table_total > 0:
-                tables_with_results[table] = {
-                    'config': config,
-                    'count': table_total,
-                    'notes_fields': notes_fields
-                }
-                total_results += table_total
+            plans[table] = plan
+        
+        # One scan per table fetches the page to display. Rather than count
+        # every match, it reads one row past the page (and at least 6 rows,
+        # enough for the Notes prompt below): a full extra row means the
+        # count is shown as e.g. "20+" and the scan can stop there
+        page_limit = max(max_results, 5) + 1 if max_results else -1
+        
+        def add_page(table, rows):
+            table_results = tables_with_results.setdefault(table, {
+                'config': plans[table]['config'],
+                'count': 0,
+                'more': False,
+                'notes_fields': plans[table]['notes_fields'],
+                'rows': []
+            })
+            more = len(rows) == page_limit
+            table_results['count'] += len(rows) - 1 if more else len(rows)
+            table_results['more'] |= more
+            table_results['rows'] += rows
+            if max_results:
+                del table_results['rows'][max_results:]
+            return table_results['count']
+        
+        page_queries = []
+        for plan in plans.values():
+            page_sql, page_params = _plan_query(plan, 'page_sql', search_term)
+            page_queries.append((page_sql, {**page_params, 'lim': page_limit}))
+        pages = _fetch_pages(cursor, page_queries)
+        
+        for table, rows in zip(plans, pages):
+            if rows:
+                total_results += add_page(table, rows)
         
         # If fewer than 5 results and include_notes not explicitly set, offer to search Notes
         if total_results < 5 and include_notes is None and any(
@@ -1596,10 +2325,18 @@ def gen_search(search_term, table_name=None, max_results=20, include_notes=None)
             response = input("🔍 Search Notes/Description fields too? (y/n): ").strip().lower()
             if response == 'y':
                 include_notes = True
-                # Recursively call with include_notes=True
-                cursor.close()
-                conn.close()
-                return gen_search(search_term, table_name, max_results, include_notes=True)
+                # Only scan the Notes fields for rows the main fields missed,
+                # and add them after the main matches
+                notes_tables = [table for table, plan in plans.items() if plan['notes_page_sql']]
+                notes_queries = []
+                for table in notes_tables:
+                    notes_sql, notes_params = _plan_query(plans[table], 'notes_page_sql', search_term)
+                    notes_queries.append((notes_sql, {**notes_params, 'lim': page_limit}))
+                notes_pages = _fetch_pages(cursor, notes_queries)
+                for table, rows in zip(notes_tables, notes_pages):
+                    if rows:
+                        add_page(table, rows)
+                total_results = sum(t['count'] for t in tables_with_results.values())
         
         # Now perform full search and display
         print(f"\n🔍 Searching for: '{search_term}'")
@@ -1613,94 +2350,86 @@ def gen_search(search_term, table_name=None, max_results=20, include_notes=None)
             if table not in tables_with_results:
                 continue
             
-            config = tables_with_results[table]['config']
-            
-            # Rebuild search with or without notes as needed
-            search_fields = config['search_fields'].copy()
-            if not include_notes:
-                notes_fields = tables_with_results[table]['notes_fields']
-                search_fields = [f for f in search_fields if f not in notes_fields]
-            
-            # Validate search fields exist
-            cursor.execute(f"PRAGMA table_info({table});")
-            table_columns = [col[1] for col in cursor.fetchall()]
-            valid_search_fields = [f for f in search_fields if f in table_columns]
-            
-            if not valid_search_fields:
-                continue
-            
-            search_conditions = ' OR '.join([f"`{field}` REGEXP ?" for field in valid_search_fields])
-            search_params = [search_term] * len(valid_search_fields)
-            
-            # Validate display fields and filter to only existing ones
-            valid_display_fields = [f for f in config['display_fields'] if f in table_columns]
-            if not valid_display_fields:
-                valid_display_fields = ['UID']  # Fallback to just UID
-            
-            # Get results with limit - escape column names with backticks
-            display_cols = ', '.join([f"`{f}`" for f in valid_display_fields])
-            query = f"""
-                SELECT {display_cols}
-                FROM {table}
-                WHERE {search_conditions}
-                LIMIT ?;
-            """
-            cursor.execute(query, search_params + [max_results])
-            results = cursor.fetchall()
-            
-            if not results:
-                continue
+            plan = plans[table]
+            config = plan['config']
+            valid_display_fields = plan['display_fields']
+            fk_lookups = plan['fk_lookups']
+            main_field = valid_display_fields[1] if len(valid_display_fields) > 1 else valid_display_fields[0]
+            results = tables_with_results[table]['rows']
             
             # Display results
-            print(f"\n{config['emoji']} {table.upper()} (showing {len(results)} of {tables_with_results[table]['count']} matches)")
+            table_count = tables_with_results[table]['count']
+            more = '+' if tables_with_results[table]['more'] else ''
+            print(f"\n{config['emoji']} {table.upper()} (showing {len(results)} of {table_count}{more} matches)")
             print("=" * 80)
             
-            for i, row in enumerate(results, 1):
-                # Create display dictionary
-                result_dict = dict(zip(valid_display_fields, row))
+            # Related records, definitions and location attributes for the
+            # whole page are fetched up front, one query each, rather than
+            # once per record
+            records = [dict(zip(valid_display_fields, row)) for row in results]
+            page_uids = [record.get('UID') for record in records]
+            page_related = page_definitions = page_attributes = None
+            if config.get('related_tables'):
+                page_related = _fetch_related_records(cursor, page_uids, config['related_tables'])
+            if 'definitions_table' in config:
+                page_definitions = _fetch_definitions(cursor, page_uids, config['definitions_table'], config['definitions_fk'])
+            if 'location_attributes_table' in config:
+                page_attributes = _fetch_location_attributes(cursor, page_uids)
+            
+            # Likewise one query per foreign key: {field: {UID: display value}}.
+            # Values are normalized to integer UIDs first (_match_uid only
+            # holds integers); anything else can't match a UID and is skipped
+            fk_displays = {}
+            for fk_field, fk_query, fk_label in fk_lookups:
+                fk_values = {_uid_key(record.get(fk_field)) for record in records} - {None}
+                if fk_values:
+                    _load_match_uids(cursor, fk_values)
+                    fk_displays[fk_field] = dict(cursor.execute(fk_query))
+            
+            for i, result_dict in enumerate(records, 1):
                 uid = result_dict.get('UID')
                 
+                # The record's own lines are collected and written in one print
                 # Display main identifier
-                main_field = valid_display_fields[1] if len(valid_display_fields) > 1 else valid_display_fields[0]
-                print(f"{i}. {result_dict.get(main_field, 'N/A')} (UID: {uid})")
+                lines = [f"{i}. {result_dict.get(main_field, 'N/A')} (UID: {uid})"]
                 
                 # Display other fields
                 for field in valid_display_fields[2:]:  # Skip UID and main field
                     value = result_dict.get(field)
                     if value:
-                        # Truncate long text fields
-                        if isinstance(value, str) and len(value) > 100:
-                            value = value[:100] + "..."
-                        print(f"   📝 {field}: {value}")
+                        # Long text is already truncated by the query
+                        lines.append(f"   📝 {field}: {value}")
                 
                 # Resolve foreign keys
-                for fk_field, fk_config in config['foreign_keys'].items():
-                    fk_value = result_dict.get(fk_field)
-                    if fk_value:
-                        fk_query = f"SELECT {fk_config['display_field']} FROM {fk_config['table']} WHERE UID = ?;"
-                        cursor.execute(fk_query, (fk_value,))
-                        fk_result = cursor.fetchone()
-                        if fk_result:
-                            print(f"   🔗 {fk_config['label']}: {fk_result[0]}")
+                for fk_field, fk_query, fk_label in fk_lookups:
+                    fk_value = _uid_key(result_dict.get(fk_field))
+                    if fk_value and fk_value in fk_displays.get(fk_field, {}):
+                        lines.append(f"   🔗 {fk_label}: {fk_displays[fk_field][fk_value]}")
+                
+                print("\n".join(lines))
                 
                 # Check for relationships (if this is a table with relationship joins)
                 if 'related_tables' in config and config['related_tables']:
-                    _display_related_records(cursor, table, uid, config['related_tables'])
+                    _display_related_records(cursor, table, uid, config['related_tables'],
+                                             page_related.get(uid) if page_related is not None else None)
                 
                 # Check for definitions (special case for lexicon and social_roles)
                 if 'definitions_table' in config:
-                    _display_definitions(cursor, uid, config['definitions_table'], config['definitions_fk'])
+                    _display_definitions(cursor, uid, config['definitions_table'], config['definitions_fk'],
+                                         page_definitions.get(uid) if page_definitions is not None else None)
                 
                 # Check for location attributes (special case for gazetteer)
                 if 'location_attributes_table' in config:
-                    _display_location_attributes(cursor, uid)
+                    _display_location_attributes(cursor, uid,
+                                                 page_attributes.get(uid) if page_attributes is not None else None)
                 
                 print()
             
             displayed_results += len(results)
         
         print("=" * 80)
-        print(f"📊 SUMMARY: {displayed_results} results displayed, {total_results} total matches across {len(tables_with_results)} table(s)")
+        more = '+' if any(t['more'] for t in tables_with_results.values()) else ''
+        print(f"📊 SUMMARY: {displayed_results} results displayed, {total_results}{more} total matches across {len(tables_with_results)} table(s)")
         
     except Exception as e:
         print(f"❌ Search error: {e}")
@@ -1708,7 +2437,6 @@ def gen_search(search_term, table_name=None, max_results=20, include_notes=None)
         traceback.print_exc()
     finally:
         cursor.close()
-        conn.close()
 
 
 """
@@ -1922,21 +2650,22 @@ def _get_bib_records_for_cite(uids):
     Returns:
         list of dicts, one per matching UID, in the order UIDs were supplied.
     """
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
 
     try:
-        placeholders = ','.join(['?' for _ in uids])
-        cursor.execute(f"""
+        # Join against the TEMP UID table so the statement is the same for
+        # any number of UIDs (and never hits SQLite's parameter limit)
+        _load_match_uids(cursor, uids)
+        cursor.execute("""
             SELECT b.UID, b.Author, b.Title, b.Gloss,
                    b.Date_Pub_Greg, b.Date_Pub_Hij,
                    b.Catalog_No, b.Language, b.Status, b.Tags,
                    b.Notes, b.Type, b.Folios,
                    r.Acronym
-            FROM bibliography b
+            FROM _match_uid m
+            JOIN bibliography b ON b.UID = m.uid
             LEFT JOIN repositories r ON b.Repository_ID = r.UID
-            WHERE b.UID IN ({placeholders})
-        """, uids)
+        """)
 
         cols = ['uid', 'author', 'title', 'gloss', 'date_greg', 'date_hij',
                 'catalog_no', 'language', 'status', 'tags', 'notes',
@@ -1949,7 +2678,6 @@ def _get_bib_records_for_cite(uids):
 
     finally:
         cursor.close()
-        conn.close()
 
 
 def _get_related_sources_for_cite(uid):
@@ -1975,8 +2703,7 @@ def _get_related_sources_for_cite(uid):
             other_type     (str or None)
             other_acronym  (str or None)
     """
-    conn = sqlite3.connect(database_path)
-    cursor = conn.cursor()
+    cursor = _get_conn().cursor()
 
     try:
         cursor.execute("""
@@ -2008,7 +2735,6 @@ def _get_related_sources_for_cite(uid):
 
     finally:
         cursor.close()
-        conn.close()
 
 
 def _tokenize_for_report(value):
@@ -2187,26 +2913,21 @@ def cite(report=False):
 
     else:
         # ── Search mode ───────────────────────────────────────────────────
-        conn_s = sqlite3.connect(database_path)
-        _register_regex(conn_s)
-        c = conn_s.cursor()
+        c = _get_conn().cursor()
 
         try:
-            c.execute("""
+            where_sql, where_params = _regexp_clause(
+                ['b.Author', 'b.Title', 'b.Gloss', 'b.Notes', 'b.Catalog_No'], raw)
+            c.execute(f"""
                 SELECT b.UID, b.Author, b.Title, b.Catalog_No
                 FROM bibliography b
-                WHERE b.Author     REGEXP ?
-                   OR b.Title      REGEXP ?
-                   OR b.Gloss      REGEXP ?
-                   OR b.Notes      REGEXP ?
-                   OR b.Catalog_No REGEXP ?
+                WHERE {where_sql}
                 ORDER BY b.Author, b.Title
                 LIMIT 30
-            """, (raw, raw, raw, raw, raw))
+            """, where_params)
             results = c.fetchall()
         finally:
             c.close()
-            conn_s.close()
 
         if not results:
             print(f"❌ No matches for '{raw}'")